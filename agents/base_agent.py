@@ -8,16 +8,22 @@ including A2A communication, MCP tool usage, and common agent behaviors.
 import asyncio
 import json
 import logging
+import time
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Union
+from dataclasses import dataclass, asdict, replace
 
 import boto3
 import structlog
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -40,6 +46,48 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+def install_event_loop():
+    """
+    Use the libuv-based event loop when uvloop is installed (not supported on Windows).
+    
+    Call from the entry point before starting the event loop; importing the agents
+    leaves the global event loop policy untouched.
+    """
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional; keep the default event loop
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize datetime-like values (including pandas Timestamps) as ISO strings."""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize a payload to JSON bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode()
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Timestream WriteRecords accepts at most this many records per request
+TIMESTREAM_MAX_RECORDS_PER_WRITE = 100
+
+# Maximum number of Timestream write requests in flight per agent
+TIMESTREAM_MAX_CONCURRENT_WRITES = 4
+
+
 @dataclass
 class AgentMessage:
     """Represents a message between agents in the A2A communication system."""
@@ -58,12 +106,30 @@ class AgentMessage:
         data['timestamp'] = self.timestamp.isoformat()
         return data
 
+    def to_json(self) -> bytes:
+        """Serialize the message to JSON bytes for the transport, without copying the payload."""
+        return dumps_json({
+            'message_id': self.message_id,
+            'sender_id': self.sender_id,
+            'recipient_id': self.recipient_id,
+            'message_type': self.message_type,
+            'timestamp': self.timestamp.isoformat(),
+            'payload': self.payload,
+            'priority': self.priority,
+            'correlation_id': self.correlation_id
+        })
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AgentMessage':
         """Create message from dictionary format."""
         data['timestamp'] = datetime.fromisoformat(data['timestamp'])
         return cls(**data)
 
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> 'AgentMessage':
+        """Create message from JSON produced by to_json."""
+        return cls.from_dict(loads_json(data))
+
 
 class AgentConfig(BaseModel):
     """Configuration for an agent."""
@@ -101,6 +167,9 @@ class BaseAgent(ABC):
         self.timestream_query_client = boto3.client('timestream-query')
         self.lambda_client = boto3.client('lambda')
         
+        # boto3 calls block, so Timestream writes run in worker threads with bounded concurrency
+        self._timestream_write_semaphore = asyncio.Semaphore(TIMESTREAM_MAX_CONCURRENT_WRITES)
+        
         # Message queue for A2A communication
         self.message_queue: asyncio.Queue = asyncio.Queue()
         self.message_history: List[AgentMessage] = []
@@ -115,7 +184,7 @@ class BaseAgent(ABC):
             agent_type=self.agent_type
         )
         
-        self.logger.info("Agent initialized", config=config.dict())
+        self.logger.info("Agent initialized", config=config.model_dump(exclude_defaults=True))
 
     async def start(self):
         """Start the agent and begin processing."""
@@ -160,20 +229,10 @@ class BaseAgent(ABC):
         Returns:
             Message ID of the sent message
         """
-        message = AgentMessage(
-            message_id=str(uuid.uuid4()),
-            sender_id=self.agent_id,
-            recipient_id=recipient_id,
-            message_type=message_type,
-            timestamp=datetime.now(timezone.utc),
-            payload=payload,
-            priority=priority,
-            correlation_id=correlation_id
+        message = self._build_and_record_message(
+            recipient_id, message_type, payload, priority, correlation_id, datetime.now(timezone.utc)
         )
         
-        # Add to message history
-        self.message_history.append(message)
-        
         # In a real implementation, this would send via Bedrock Agents A2A
         # For now, we'll simulate by adding to the recipient's queue
         self.logger.info("Message sent", 
@@ -183,6 +242,59 @@ class BaseAgent(ABC):
         
         return message.message_id
 
+    async def send_message_many(self, recipient_ids: Sequence[str], message_type: str, payload: Dict[str, Any],
+                                priority: int = 0, correlation_id: Optional[str] = None) -> List[str]:
+        """
+        Send the same message to several agents via A2A communication.
+        
+        Each message gets its own shallow copy of the payload; nested values are
+        shared between recipients, so treat them as read-only.
+        
+        Args:
+            recipient_ids: IDs of the recipient agents
+            message_type: Type of message being sent
+            payload: Message content
+            priority: Message priority (0-9, higher is more important)
+            correlation_id: Optional correlation ID for tracking related messages
+            
+        Returns:
+            Message IDs of the sent messages, in recipient order
+        """
+        timestamp = datetime.now(timezone.utc)
+        messages = [
+            self._build_and_record_message(
+                recipient_id, message_type, payload.copy(), priority, correlation_id, timestamp
+            )
+            for recipient_id in recipient_ids
+        ]
+        
+        # In a real implementation, this would send via Bedrock Agents A2A
+        # For now, we'll simulate by adding to the recipients' queues
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Message sent to many", 
+                            recipient_ids=list(recipient_ids),
+                            message_type=message_type,
+                            message_ids=[message.message_id for message in messages])
+        
+        return [message.message_id for message in messages]
+
+    def _build_and_record_message(self, recipient_id: str, message_type: str, payload: Dict[str, Any],
+                                  priority: int, correlation_id: Optional[str],
+                                  timestamp: datetime) -> AgentMessage:
+        """Create an outgoing message and add it to the message history."""
+        message = AgentMessage(
+            message_id=str(uuid.uuid4()),
+            sender_id=self.agent_id,
+            recipient_id=recipient_id,
+            message_type=message_type,
+            timestamp=timestamp,
+            payload=payload,
+            priority=priority,
+            correlation_id=correlation_id
+        )
+        self.message_history.append(message)
+        return message
+
     async def receive_message(self, message: AgentMessage):
         """
         Receive a message from another agent.
@@ -201,17 +313,18 @@ class BaseAgent(ABC):
             try:
                 # Wait for message with timeout
                 message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-                
+            except asyncio.TimeoutError:
+                continue
+            
+            try:
                 # Process message
                 await self._process_message(message)
                 
-                # Mark as done
-                self.message_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 self.logger.error("Error processing message", error=str(e))
+            finally:
+                # Mark as done, even if processing failed, so queue.join() never hangs
+                self.message_queue.task_done()
 
     async def _process_message(self, message: AgentMessage):
         """
@@ -229,6 +342,8 @@ class BaseAgent(ABC):
             await self._handle_heartbeat(message)
         elif message.message_type == "status_request":
             await self._handle_status_request(message)
+        elif message.message_type == "emergency_batch":
+            await self._handle_emergency_batch(message)
         else:
             await self._handle_custom_message(message)
 
@@ -245,6 +360,20 @@ class BaseAgent(ABC):
             correlation_id=message.correlation_id
         )
 
+    async def _handle_emergency_batch(self, message: AgentMessage):
+        """Unpack a batch of emergency signals and process each one as its own message."""
+        for signal in message.payload.get('signals', []):
+            try:
+                await self._process_message(replace(
+                    message,
+                    message_type=signal['message_type'],
+                    payload=signal['payload']
+                ))
+            except Exception as e:
+                # One bad signal must not drop the rest of the batch
+                self.logger.error("Error processing batched signal",
+                                  message_type=signal.get('message_type'), error=str(e))
+
     async def _handle_status_request(self, message: AgentMessage):
         """Handle status request messages."""
         status = await self.get_status()
@@ -303,14 +432,8 @@ class BaseAgent(ABC):
         """
         try:
             # In a real implementation, this would use the MCP protocol
-            # For now, we'll simulate by calling Lambda directly
-            response = self.lambda_client.invoke(
-                FunctionName=f"energy-demo-{tool_name}",
-                InvocationType='RequestResponse',
-                Payload=json.dumps(parameters)
-            )
-            
-            response_payload = json.loads(response['Payload'].read())
+            # For now, we'll simulate by calling Lambda directly, off the event loop
+            response_payload = loads_json(await asyncio.to_thread(self._invoke_tool, tool_name, parameters))
             self.logger.info("MCP tool called", 
                            tool_name=tool_name,
                            response=response_payload)
@@ -323,35 +446,68 @@ class BaseAgent(ABC):
                             error=str(e))
             raise
 
+    def _invoke_tool(self, tool_name: str, parameters: Dict[str, Any]) -> bytes:
+        """Invoke an MCP tool's Lambda function and read its raw response; blocks, so run it in a thread."""
+        response = self.lambda_client.invoke(
+            FunctionName=f"energy-demo-{tool_name}",
+            InvocationType='RequestResponse',
+            Payload=dumps_json(parameters)
+        )
+        return response['Payload'].read()
+
     async def store_timeseries_data(self, table_name: str, records: List[Dict[str, Any]]):
         """
         Store time series data in Amazon Timestream.
         
         Args:
             table_name: Name of the Timestream table
-            records: List of records to store
+            records: List of records to store. A record with a 'measure_values'
+                dict is written as a single multi-measure record.
         """
         try:
+            # Dimensions and value type are shared by every record
+            common_attributes = {
+                'Dimensions': [
+                    {'Name': 'agent_id', 'Value': self.agent_id},
+                    {'Name': 'agent_type', 'Value': self.agent_type}
+                ],
+                'MeasureValueType': 'DOUBLE'
+            }
+            
+            # Records without a timestamp are stamped with the time of this call (epoch millis)
+            default_time = str(time.time_ns() // 1_000_000)
+            
             # Convert records to Timestream format
             timestream_records = []
             for record in records:
-                timestream_records.append({
-                    'Dimensions': [
-                        {'Name': 'agent_id', 'Value': self.agent_id},
-                        {'Name': 'agent_type', 'Value': self.agent_type}
-                    ],
+                timestamp = record.get('timestamp')
+                timestream_record = {
                     'MeasureName': record.get('measure_name', 'value'),
-                    'MeasureValue': str(record.get('value', 0)),
-                    'MeasureValueType': 'DOUBLE',
-                    'Time': str(int(record.get('timestamp', datetime.now().timestamp()) * 1000))
-                })
+                    'Time': default_time if timestamp is None else str(int(timestamp * 1000))
+                }
+                
+                measure_values = record.get('measure_values')
+                if measure_values:
+                    # Multi-measure record carrying several values at one timestamp
+                    timestream_record['MeasureValueType'] = 'MULTI'
+                    timestream_record['MeasureValues'] = [
+                        {'Name': name, 'Value': str(value), 'Type': 'DOUBLE'}
+                        for name, value in measure_values.items()
+                    ]
+                else:
+                    timestream_record['MeasureValue'] = str(record.get('value', 0))
+                
+                timestream_records.append(timestream_record)
             
-            # Write to Timestream
-            self.timestream_client.write_records(
-                DatabaseName='energy_demo',
-                TableName=table_name,
-                Records=timestream_records
-            )
+            # Write to Timestream, at most 100 records per request
+            await asyncio.gather(*(
+                self._write_timestream_records(
+                    table_name,
+                    timestream_records[start:start + TIMESTREAM_MAX_RECORDS_PER_WRITE],
+                    common_attributes
+                )
+                for start in range(0, len(timestream_records), TIMESTREAM_MAX_RECORDS_PER_WRITE)
+            ))
             
             self.logger.info("Time series data stored", 
                            table_name=table_name,
@@ -363,6 +519,18 @@ class BaseAgent(ABC):
                             error=str(e))
             raise
 
+    async def _write_timestream_records(self, table_name: str, records: List[Dict[str, Any]],
+                                        common_attributes: Dict[str, Any]):
+        """Write one request's worth of records without blocking the event loop."""
+        async with self._timestream_write_semaphore:
+            await asyncio.to_thread(
+                self.timestream_client.write_records,
+                DatabaseName='energy_demo',
+                TableName=table_name,
+                Records=records,
+                CommonAttributes=common_attributes
+            )
+
     async def query_timeseries_data(self, query: str) -> List[Dict[str, Any]]:
         """
         Query time series data from Amazon Timestream.
@@ -374,7 +542,7 @@ class BaseAgent(ABC):
             Query results
         """
         try:
-            response = self.timestream_query_client.query(QueryString=query)
+            response = await asyncio.to_thread(self.timestream_query_client.query, QueryString=query)
             
             # Process results
             results = []
@@ -396,6 +564,40 @@ class BaseAgent(ABC):
                             error=str(e))
             raise
 
+    async def query_timeseries_columns(self, query: str) -> Dict[str, List[Optional[str]]]:
+        """
+        Query time series data from Amazon Timestream in columnar form.
+        
+        Unlike query_timeseries_data, no per-row dicts are built; each column's
+        scalar values are collected into a single list.
+        
+        Args:
+            query: SQL query to execute
+            
+        Returns:
+            Mapping of column name to its values, one per row
+        """
+        try:
+            response = await asyncio.to_thread(self.timestream_query_client.query, QueryString=query)
+            
+            rows = response['Rows']
+            results = {
+                column['Name']: [row['Data'][i].get('ScalarValue') for row in rows]
+                for i, column in enumerate(response['ColumnInfo'])
+            }
+            
+            self.logger.info("Time series data queried", 
+                           query=query,
+                           result_count=len(rows))
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error("Error querying time series data", 
+                            query=query,
+                            error=str(e))
+            raise
+
     def get_config(self) -> Dict[str, Any]:
         """Get agent configuration."""
         return self.config.dict()
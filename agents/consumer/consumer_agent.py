@@ -6,13 +6,23 @@ optimizes when to buy energy and when to use stored energy based on prices.
 """
 
 import asyncio
+import heapq
+import itertools
 import json
-import random
+import logging
+import math
+import time
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 import numpy as np
 
 from ..base_agent import BaseAgent, AgentConfig, AgentMessage
+from .consumer_kernels import (
+    ACTION_BUY, ACTION_HOLD, LEVEL_HIGH, LEVEL_MEDIUM,
+    TREND_FALLING, TREND_RISING, TREND_STABLE, decide
+)
 
 
 class ConsumerAgentConfig(AgentConfig):
@@ -29,6 +39,73 @@ class ConsumerAgentConfig(AgentConfig):
     peak_shaving_enabled: bool = True  # Whether to use battery for peak shaving
 
 
+@dataclass
+class TradingDecision:
+    """A trading decision made by the consumer agent."""
+    __slots__ = ('action', 'quantity_mw', 'price_per_mwh', 'priority', 'valid_until_ts')
+    action: str  # buy or use_battery
+    quantity_mw: float
+    price_per_mwh: float
+    priority: str
+    valid_until_ts: float  # Epoch seconds
+
+
+@dataclass
+class Bid:
+    """An energy bid sent to the market supervisor."""
+    __slots__ = ('bid_id', 'consumer_id', 'quantity_mw', 'price_per_mwh', 'priority',
+                 'valid_until_ts', 'timestamp_ts')
+    bid_id: str
+    consumer_id: str
+    quantity_mw: float
+    price_per_mwh: float
+    priority: str
+    valid_until_ts: float  # Epoch seconds
+    timestamp_ts: float  # Epoch seconds
+
+    def to_wire(self) -> Dict[str, Any]:
+        """Convert bid to the message payload format."""
+        return {
+            'bid_id': self.bid_id,
+            'consumer_id': self.consumer_id,
+            'quantity_mw': self.quantity_mw,
+            'price_per_mwh': self.price_per_mwh,
+            'priority': self.priority,
+            'valid_until': datetime.fromtimestamp(self.valid_until_ts, timezone.utc).isoformat(),
+            'timestamp': datetime.fromtimestamp(self.timestamp_ts, timezone.utc).isoformat()
+        }
+
+
+# Natural battery discharge of 0.1% per minute, as a per-second log rate
+BATTERY_DECAY_RATE_PER_SECOND = math.log(0.999) / 60.0
+
+# Largest share of current consumption a demand response signal can shed
+DEMAND_RESPONSE_MAX_REDUCTION_FRACTION = 0.3
+
+# Yield to the event loop after this many handled messages
+MESSAGES_PER_YIELD = 50
+
+# Measures written to Timestream on every consumption tick
+CONSUMER_METRICS = (
+    'factory_consumption',
+    'battery_level',
+    'available_battery_capacity',
+    'market_price',
+    'demand_response_active'
+)
+
+# Buffered Timestream writes are flushed at this many ticks (one record each) or after this many seconds
+TIMESTREAM_FLUSH_MAX_ROWS = 100
+TIMESTREAM_FLUSH_INTERVAL_SECONDS = 600.0
+
+
+def _kahan_add(total: float, compensation: float, value: float) -> Tuple[float, float]:
+    """Add value to a running total using Kahan summation; returns (total, compensation)."""
+    y = value - compensation
+    t = total + y
+    return t, (t - total) - y
+
+
 class ConsumerAgent(BaseAgent):
     """
     Consumer Agent representing a factory with battery storage.
@@ -41,63 +118,258 @@ class ConsumerAgent(BaseAgent):
     - Grid stability signals
     """
 
+    # Scheduler shared by all running consumer agents:
+    # heap of (due_time, sequence, agent, task_name) on the event loop clock
+    _shared_schedule: List[Tuple[float, int, 'ConsumerAgent', str]] = []
+    _shared_schedule_seq = itertools.count()  # Tie-breaker so agents are never compared
+    _shared_wakeup: Optional[asyncio.Event] = None
+    _shared_scheduler_task: Optional[asyncio.Task] = None
+    _shared_running: Set[asyncio.Task] = set()  # Scheduled task runs in flight, kept referenced until done
+    _instances: 'weakref.WeakSet[ConsumerAgent]' = weakref.WeakSet()  # Running agents
+
     def __init__(self, config: ConsumerAgentConfig):
         super().__init__(config)
         self.consumer_config = config
         
         # Consumption state
         self.current_consumption: float = config.base_consumption_mw
-        self.battery_level: float = config.battery_capacity_mwh * 0.5  # Start at 50%
+        self._battery_level_raw: float = 0.0  # Level as of _battery_t0, before decay
+        self._battery_t0: float = time.monotonic()
+        self.battery_level = config.battery_capacity_mwh * 0.5  # Start at 50%
         self.available_battery_capacity: float = config.battery_capacity_mwh * 0.5
         
         # Market state
         self.current_market_price: float = 50.0
-        self.price_history: List[Tuple[datetime, float]] = []
+        # Price history as a fixed-size ring buffer of parallel arrays
+        self._price_capacity: int = 4096
+        self._prices: np.ndarray = np.zeros(self._price_capacity, dtype=np.float32)
+        self._price_ts: np.ndarray = np.zeros(self._price_capacity, dtype=np.int64)  # Epoch seconds
+        self._price_head: int = 0  # Next write position
+        self._price_len: int = 0
+        self._price_version: int = 0  # Incremented on every new price
+        
+        # Hourly average price cache, keyed on (price version, hour)
+        self._hourly_avg_key: Optional[Tuple[int, int]] = None
+        self._hourly_avg: Optional[float] = None
         self.forecast_data: Optional[Dict[str, Any]] = None
         
         # Trading state
-        self.active_bids: List[Dict[str, Any]] = []
-        self.completed_purchases: List[Dict[str, Any]] = []
+        self.active_bids: Dict[str, Bid] = {}  # Keyed by bid_id
+        self._bid_expiry_heap: List[Tuple[float, str]] = []  # (expiry on loop clock, bid_id)
+        
+        # Bid IDs are a per-process sequence; the start epoch keeps them unique across restarts
+        self._bid_id_prefix: str = f"bid_{self.agent_id}_{int(time.time())}_"
+        self._bid_seq: int = 0
+        
+        # Recent purchases as a fixed-size ring buffer of parallel arrays
+        self._purchase_capacity: int = 10_000
+        self._purchase_quantities: np.ndarray = np.zeros(self._purchase_capacity, dtype=np.float64)
+        self._purchase_prices: np.ndarray = np.zeros(self._purchase_capacity, dtype=np.float64)
+        self._purchase_ts: np.ndarray = np.zeros(self._purchase_capacity, dtype=np.float64)  # Epoch seconds
+        self._purchase_count: int = 0  # Lifetime number of purchases
+        self._purchases_flushed: int = 0  # Lifetime number of purchases written to Timestream
+        
+        # Running totals with Kahan compensation terms
         self.total_energy_purchased: float = 0.0
         self.total_cost: float = 0.0
+        self._total_energy_purchased_c: float = 0.0
+        self._total_cost_c: float = 0.0
         
         # Production schedule
         self.production_schedule: List[Dict[str, Any]] = []
         self.current_shift: str = "day"  # day, night, maintenance
         
+        # Shift lookup tables built from the production schedule
+        self._shift_names: Tuple[str, ...] = ()
+        self._shift_multipliers: np.ndarray = np.ones(1, dtype=np.float64)
+        self._hour_to_shift: np.ndarray = np.full(24, -1, dtype=np.int8)
+        self._shift_idx: int = -1
+        
+        # Periodic task intervals in seconds, read again each time a task is rescheduled
+        self._task_intervals: Dict[str, float] = {
+            'consumption_monitoring': 60.0,  # 1 minute intervals
+            'trading': 0.0,  # Follows the trading config, set by _update_thresholds
+            'battery_optimization': 300.0,  # 5 minutes
+            'demand_response': 60.0,  # 1 minute intervals
+            'timestream_flush': TIMESTREAM_FLUSH_INTERVAL_SECONDS
+        }
+        
+        # Consumption bounds, decision thresholds and trading cadence derived from config
+        self._update_thresholds()
+        
         # Demand response
         self.demand_response_active: bool = False
         self.demand_response_target: float = 0.0
         self.demand_response_duration: timedelta = timedelta(minutes=0)
+        self._demand_response_ends_at: float = 0.0
+        self._demand_response_wakeup_at: Optional[float] = None  # Pending end check on the loop clock
+        
+        # Per-tick clock, refreshed once before each scheduled task runs; runs of one agent are serialized
+        self._now: datetime = datetime.now(timezone.utc)
+        self._now_ts: float = self._now.timestamp()  # Epoch seconds
+        self._now_mono: float = time.monotonic()
+        
+        # Tasks run by the shared scheduler; tasks without an interval are one-shot
+        self._scheduled_tasks = {
+            'consumption_monitoring': self._consumption_monitoring_tick,
+            'trading': self._trading_tick,
+            'battery_optimization': self._battery_optimization_tick,
+            'demand_response': self._demand_response_tick,
+            'demand_response_end': self._update_demand_response_status,
+            'timestream_flush': self._flush_timeseries_buffer,
+            'timestream_flush_now': self._flush_timeseries_buffer
+        }
+        self._running_ticks: Set[asyncio.Task] = set()  # This agent's scheduled task runs in flight
+        self._tick_lock: Optional[asyncio.Lock] = None  # Created on start, on the running loop
+        
+        # Message handlers keyed by message type
+        self._message_handlers = {
+            'energy_forecast': self._handle_energy_forecast,
+            'trade_executed': self._handle_trade_executed,
+            'bid_accepted': self._handle_bid_accepted,
+            'bid_rejected': self._handle_bid_rejected,
+            'demand_response_signal': self._handle_demand_response_signal,
+            'market_performance_report': self._handle_market_performance_report
+        }
+        self._msgs_since_yield: int = 0
+        
+        # Time series samples waiting to be written to Timestream, one column per measure
+        self._measure_cols: Dict[str, np.ndarray] = {
+            name: np.empty(TIMESTREAM_FLUSH_MAX_ROWS, dtype=np.float64) for name in CONSUMER_METRICS
+        }
+        self._ts_col: np.ndarray = np.empty(TIMESTREAM_FLUSH_MAX_ROWS, dtype=np.float64)  # Epoch seconds
+        self._ts_idx: int = 0  # Number of buffered rows
+        self._ts_flush_pending: bool = False  # An early flush has been scheduled
         
         # Performance metrics
         self.energy_cost_savings: float = 0.0
         self.peak_shaving_savings: float = 0.0
         self.demand_response_revenue: float = 0.0
         
-        self.logger.info("Consumer Agent initialized", config=config.dict())
+        # Status payload skeleton, filled in place by get_status
+        self._status_template: Dict[str, Dict[str, Any]] = {
+            'consumption_status': {
+                'current_consumption_mw': 0.0,
+                'battery_level_mwh': 0.0,
+                'available_battery_capacity_mwh': 0.0,
+                'current_shift': '',
+                'demand_response_active': False
+            },
+            'trading_status': {
+                'current_market_price': 0.0,
+                'active_bids_count': 0,
+                'completed_purchases_count': 0,
+                'total_energy_purchased_mwh': 0.0,
+                'total_cost': 0.0
+            },
+            'optimization_metrics': {
+                'energy_cost_savings': 0.0,
+                'peak_shaving_savings': 0.0,
+                'demand_response_revenue': 0.0,
+                'forecast_data_available': False
+            }
+        }
+        
+        self.logger.info("Consumer Agent initialized")
+
+    def _update_thresholds(self):
+        """Precompute consumption bounds, decision thresholds and the trading interval from config."""
+        config = self.consumer_config
+        capacity = config.battery_capacity_mwh
+        
+        self._base_consumption: float = config.base_consumption_mw
+        self._min_consumption: float = config.min_consumption_mw
+        self._max_consumption: float = config.max_consumption_mw
+        self._high_consumption_threshold: float = config.base_consumption_mw * 1.1
+        self._max_bid_quantity: float = config.max_consumption_mw * 1.5
+        
+        self._battery_low_threshold: float = capacity * 0.3
+        self._battery_high_threshold: float = capacity * 0.8
+        self._battery_dr_threshold: float = capacity * 0.4
+        
+        self._price_high_threshold: float = config.max_price_per_mwh * 0.8
+        self._price_dr_threshold: float = config.max_price_per_mwh * 0.9
+        
+        self._dr_enabled: bool = bool(config.demand_response_enabled)
+        
+        self._task_intervals['trading'] = config.trading_interval_minutes * 60.0
+
+    def update_config(self, updates: Dict[str, Any]):
+        """Update agent configuration and refresh derived thresholds."""
+        super().update_config(updates)
+        self._update_thresholds()
+
+    @property
+    def battery_level(self) -> float:
+        """Current battery level (MWh), including natural discharge since the last write."""
+        elapsed = time.monotonic() - self._battery_t0
+        return self._battery_level_raw * math.exp(BATTERY_DECAY_RATE_PER_SECOND * elapsed)
+
+    @battery_level.setter
+    def battery_level(self, value: float):
+        # Ensure battery level stays within bounds
+        self._battery_level_raw = max(0.0, min(value, self.consumer_config.battery_capacity_mwh))
+        self._battery_t0 = time.monotonic()
 
     async def _start_agent_specific(self):
         """Start consumer-specific tasks."""
         # Initialize production schedule
         await self._initialize_production_schedule()
         
-        # Start consumption monitoring
-        asyncio.create_task(self._consumption_monitoring_loop())
-        
-        # Start trading loop
-        asyncio.create_task(self._trading_loop())
+        # Warm up the decision kernel so trading never pays compile latency
+        decide(50.0, LEVEL_MEDIUM, LEVEL_MEDIUM, TREND_STABLE, 50.0, 100.0, 80.0, 15.0, 150.0, 180.0)
         
-        # Start battery optimization
-        asyncio.create_task(self._battery_optimization_loop())
+        # Run all periodic tasks from the scheduler shared by every consumer agent
+        cls = ConsumerAgent
+        task = cls._shared_scheduler_task
+        if task is None or task.done():
+            # Drop state left behind by agents on a previous event loop
+            cls._shared_schedule.clear()
+            cls._shared_running.clear()
+            cls._instances.clear()
+            cls._shared_wakeup = asyncio.Event()
+            cls._shared_scheduler_task = asyncio.create_task(cls._run_shared_scheduler())
         
-        # Start demand response monitoring
-        asyncio.create_task(self._demand_response_loop())
+        self._tick_lock = asyncio.Lock()
+        cls._instances.add(self)
+        for task_name, interval in self._task_intervals.items():
+            # The first flush waits a full interval; everything else runs immediately
+            self._schedule_task(task_name, interval if task_name == 'timestream_flush' else 0.0)
         
         self.logger.info("Consumer Agent started")
 
     async def _stop_agent_specific(self):
         """Stop consumer-specific tasks."""
+        # Remove this agent's tasks from the shared scheduler
+        cls = ConsumerAgent
+        cls._instances.discard(self)
+        cls._shared_schedule[:] = [entry for entry in cls._shared_schedule if entry[2] is not self]
+        heapq.heapify(cls._shared_schedule)
+        
+        # Cancel this agent's task runs still in flight, except the one stopping it
+        current = asyncio.current_task()
+        in_flight = [task for task in self._running_ticks if task is not current]
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        
+        # Cancel the scheduler once the last agent has stopped
+        task = cls._shared_scheduler_task
+        if not cls._instances and task is not None:
+            task.cancel()
+            # Awaiting is only possible from outside the scheduler task itself
+            if task is not asyncio.current_task():
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            cls._shared_scheduler_task = None
+            cls._shared_wakeup = None
+        
+        # Write out anything still buffered
+        await self._flush_timeseries_buffer()
+        
         self.logger.info("Consumer Agent stopped")
 
     async def _initialize_production_schedule(self):
@@ -134,195 +406,228 @@ class ConsumerAgent(BaseAgent):
                 }
             ]
             
+            # Map each hour of the day to a shift index; later entries take
+            # priority where shifts overlap (maintenance within the night shift)
+            self._shift_names = tuple(s['shift'] for s in self.production_schedule)
+            # The trailing 1.0 is used when no shift covers the hour (index -1)
+            self._shift_multipliers = np.array(
+                [s['consumption_multiplier'] for s in self.production_schedule] + [1.0],
+                dtype=np.float64
+            )
+            self._hour_to_shift = np.full(24, -1, dtype=np.int8)
+            
+            for index, schedule in enumerate(self.production_schedule):
+                start_hour = schedule['start_hour']
+                end_hour = schedule['end_hour']
+                
+                for hour in range(24):
+                    # Handle shifts that cross midnight
+                    if start_hour > end_hour:
+                        in_shift = hour >= start_hour or hour < end_hour
+                    else:
+                        in_shift = start_hour <= hour < end_hour
+                    
+                    if in_shift:
+                        self._hour_to_shift[hour] = index
+            
             self.logger.info("Production schedule initialized", 
                            schedule_count=len(self.production_schedule))
             
         except Exception as e:
             self.logger.error("Error initializing production schedule", error=str(e))
 
-    async def _consumption_monitoring_loop(self):
-        """Monitor and update energy consumption."""
-        while self.is_running:
-            try:
-                # Update current shift
-                await self._update_current_shift()
-                
-                # Calculate current consumption
-                await self._calculate_consumption()
-                
-                # Update battery status
-                await self._update_battery_status()
-                
-                # Store consumption data
-                await self._store_consumption_data()
-                
-                # Wait before next update
-                await asyncio.sleep(60)  # 1 minute intervals
-                
-            except Exception as e:
-                self.logger.error("Error in consumption monitoring", error=str(e))
-                await asyncio.sleep(60)
+    def _schedule_task(self, task_name: str, delay_seconds: float):
+        """Schedule a task to run after the given delay."""
+        cls = ConsumerAgent
+        due_time = asyncio.get_running_loop().time() + delay_seconds
+        
+        # Wake the scheduler if this task is due before the one it is waiting on
+        schedule = cls._shared_schedule
+        if cls._shared_wakeup is not None and (not schedule or due_time < schedule[0][0]):
+            cls._shared_wakeup.set()
+        
+        heapq.heappush(schedule, (due_time, next(cls._shared_schedule_seq), self, task_name))
+
+    def _update_clock(self):
+        """Capture the wall-clock and loop-clock time shared by one task run."""
+        self._now = datetime.now(timezone.utc)
+        self._now_ts = self._now.timestamp()
+        self._now_mono = asyncio.get_running_loop().time()
+
+    @staticmethod
+    async def _run_shared_scheduler():
+        """Start scheduled tasks for all consumer agents as they fall due, sleeping in between."""
+        cls = ConsumerAgent
+        loop = asyncio.get_running_loop()
+        schedule = cls._shared_schedule
+        wakeup = cls._shared_wakeup
+        
+        # Runs until cancelled when the last agent stops
+        while True:
+            delay = schedule[0][0] - loop.time() if schedule else None
+            
+            if delay is None or delay > 0:
+                # Sleep until the next task is due or the schedule changes
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            # Run each due task in its own task so one agent's slow I/O never delays the others
+            _, _, agent, task_name = heapq.heappop(schedule)
+            running = asyncio.create_task(agent._run_scheduled_task(task_name))
+            cls._shared_running.add(running)
+            running.add_done_callback(cls._shared_running.discard)
+            agent._running_ticks.add(running)
+            running.add_done_callback(agent._running_ticks.discard)
 
-    async def _trading_loop(self):
-        """Main trading decision loop."""
-        while self.is_running:
+    async def _run_scheduled_task(self, task_name: str):
+        """Run one scheduled task and reschedule it if it is periodic."""
+        interval = self._task_intervals.get(task_name)
+        
+        # One run at a time per agent, so the clock captured here holds for the whole run
+        async with self._tick_lock:
+            self._update_clock()
             try:
-                # Analyze market conditions
-                market_analysis = await self._analyze_market_conditions()
-                
-                # Make trading decisions
-                trading_decisions = await self._make_trading_decisions(market_analysis)
-                
-                # Execute trades
-                await self._execute_trading_decisions(trading_decisions)
-                
-                # Update market bids
-                await self._update_market_bids()
-                
-                # Wait before next trading cycle
-                await asyncio.sleep(self.consumer_config.trading_interval_minutes * 60)
-                
+                await self._scheduled_tasks[task_name]()
             except Exception as e:
-                self.logger.error("Error in trading loop", error=str(e))
-                await asyncio.sleep(60)
+                self.logger.error("Error in scheduled task", task=task_name, error=str(e))
+                if interval is not None:
+                    interval = 60.0  # Wait before retrying
+        
+        # Periodic tasks are rescheduled while the agent is running; one-shot tasks are not
+        if interval is not None and self in ConsumerAgent._instances:
+            self._schedule_task(task_name, interval)
+
+    async def _consumption_monitoring_tick(self):
+        """Monitor and update energy consumption."""
+        # Update current shift
+        await self._update_current_shift()
+        
+        # Calculate current consumption
+        await self._calculate_consumption()
+        
+        # Update battery status
+        await self._update_battery_status()
+        
+        # Store consumption data
+        self._store_consumption_data()
+
+    async def _trading_tick(self):
+        """Run one trading decision cycle."""
+        # Analyze market conditions
+        market_analysis = await self._analyze_market_conditions()
+        
+        # Make trading decisions
+        trading_decisions = await self._make_trading_decisions(market_analysis)
+        
+        # Execute trades
+        await self._execute_trading_decisions(trading_decisions)
+        
+        # Update market bids
+        await self._update_market_bids()
 
-    async def _battery_optimization_loop(self):
+    async def _battery_optimization_tick(self):
         """Optimize battery usage for cost savings."""
-        while self.is_running:
-            try:
-                # Analyze price patterns
-                price_patterns = await self._analyze_price_patterns()
-                
-                # Optimize battery charging/discharging
-                await self._optimize_battery_usage(price_patterns)
-                
-                # Calculate savings
-                await self._calculate_energy_savings()
-                
-                # Wait before next optimization
-                await asyncio.sleep(300)  # 5 minutes
-                
-            except Exception as e:
-                self.logger.error("Error in battery optimization", error=str(e))
-                await asyncio.sleep(60)
+        # Analyze price patterns
+        price_patterns = await self._analyze_price_patterns()
+        
+        # Optimize battery charging/discharging and update savings
+        await self._optimize_battery_usage(price_patterns)
 
-    async def _demand_response_loop(self):
-        """Monitor and respond to demand response signals."""
-        while self.is_running:
-            try:
-                # Check for demand response opportunities
-                if self.consumer_config.demand_response_enabled:
-                    await self._check_demand_response_opportunities()
-                
-                # Update demand response status
-                await self._update_demand_response_status()
-                
-                # Wait before next check
-                await asyncio.sleep(60)  # 1 minute intervals
-                
-            except Exception as e:
-                self.logger.error("Error in demand response loop", error=str(e))
-                await asyncio.sleep(60)
+    async def _demand_response_tick(self):
+        """Check for demand response opportunities."""
+        if self._dr_enabled:
+            await self._check_demand_response_opportunities()
+
+    def _start_demand_response(self, duration: timedelta):
+        """Activate demand response and schedule its end."""
+        self.demand_response_active = True
+        self.demand_response_duration = duration
+        
+        delay_seconds = duration.total_seconds()
+        self._demand_response_ends_at = asyncio.get_running_loop().time() + delay_seconds
+        
+        # Coalesce repeated signals into one pending end check, unless this one ends sooner
+        if self._demand_response_wakeup_at is None or self._demand_response_ends_at < self._demand_response_wakeup_at:
+            self._demand_response_wakeup_at = self._demand_response_ends_at
+            self._schedule_task('demand_response_end', delay_seconds)
 
     async def _update_current_shift(self):
         """Update the current production shift."""
-        try:
-            current_hour = datetime.now(timezone.utc).hour
-            
-            for schedule in self.production_schedule:
-                start_hour = schedule['start_hour']
-                end_hour = schedule['end_hour']
-                
-                # Handle shifts that cross midnight
-                if start_hour > end_hour:
-                    if current_hour >= start_hour or current_hour < end_hour:
-                        self.current_shift = schedule['shift']
-                        break
-                else:
-                    if start_hour <= current_hour < end_hour:
-                        self.current_shift = schedule['shift']
-                        break
-            
+        shift_idx = int(self._hour_to_shift[self._now.hour])
+        
+        if shift_idx >= 0:
+            self._shift_idx = shift_idx
+            self.current_shift = self._shift_names[shift_idx]
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug("Current shift updated", shift=self.current_shift)
-            
-        except Exception as e:
-            self.logger.error("Error updating current shift", error=str(e))
 
     async def _calculate_consumption(self):
         """Calculate current energy consumption."""
-        try:
-            # Get base consumption for current shift
-            shift_config = next(
-                (s for s in self.production_schedule if s['shift'] == self.current_shift),
-                None
-            )
-            
-            if shift_config:
-                base_consumption = self.consumer_config.base_consumption_mw
-                multiplier = shift_config['consumption_multiplier']
-                self.current_consumption = base_consumption * multiplier
-            else:
-                self.current_consumption = self.consumer_config.base_consumption_mw
-            
-            # Apply demand response adjustments
-            if self.demand_response_active:
-                self.current_consumption = max(
-                    self.consumer_config.min_consumption_mw,
-                    self.current_consumption - self.demand_response_target
-                )
-            
-            # Ensure consumption stays within bounds
-            self.current_consumption = max(
-                self.consumer_config.min_consumption_mw,
-                min(self.current_consumption, self.consumer_config.max_consumption_mw)
-            )
-            
+        # Base consumption for the current shift, less any demand response reduction,
+        # clamped to the factory's operating bounds
+        consumption = self._base_consumption * float(self._shift_multipliers[self._shift_idx])
+        consumption -= self.demand_response_target if self.demand_response_active else 0.0
+        self.current_consumption = min(max(consumption, self._min_consumption), self._max_consumption)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug("Consumption calculated", 
-                            current_consumption=self.current_consumption,
-                            shift=self.current_shift)
-            
-        except Exception as e:
-            self.logger.error("Error calculating consumption", error=str(e))
+                              current_consumption=self.current_consumption,
+                              shift=self.current_shift)
 
     async def _update_battery_status(self):
         """Update battery storage status."""
-        try:
-            # Natural discharge (small amount)
-            self.battery_level *= 0.999  # 0.1% discharge per minute
-            
-            # Ensure battery level stays within bounds
-            self.battery_level = max(0, min(
-                self.battery_level,
-                self.consumer_config.battery_capacity_mwh
-            ))
-            
-            # Update available battery capacity
-            self.available_battery_capacity = self.battery_level
-            
-        except Exception as e:
-            self.logger.error("Error updating battery status", error=str(e))
+        # Natural discharge is applied lazily when battery_level is read,
+        # so only the available capacity needs refreshing here
+        self.available_battery_capacity = self.battery_level
+
+    def _push_price(self, timestamp: datetime, price: float):
+        """Append a price observation to the price history ring buffer."""
+        self._prices[self._price_head] = price
+        self._price_ts[self._price_head] = int(timestamp.timestamp())
+        self._price_head = (self._price_head + 1) % self._price_capacity
+        self._price_len = min(self._price_len + 1, self._price_capacity)
+        self._price_version += 1
+
+    def _recent_window(self, buffer: np.ndarray, n: int) -> np.ndarray:
+        """Return the last n entries of a price history buffer, oldest first."""
+        start = (self._price_head - n) % self._price_capacity
+        if start < self._price_head:
+            return buffer[start:self._price_head]
+        
+        # Window wraps around the end of the buffer
+        return np.concatenate((buffer[start:], buffer[:self._price_head]))
+
+    def _recent_prices(self, n: int) -> np.ndarray:
+        """Return the last n prices, oldest first."""
+        return self._recent_window(self._prices, n)
 
     async def _analyze_market_conditions(self) -> Dict[str, Any]:
         """Analyze current market conditions for trading decisions."""
         try:
             analysis = {
                 'current_price': self.current_market_price,
-                'price_trend': 'stable',
-                'demand_level': 'medium',
-                'supply_level': 'medium',
+                'price_trend': TREND_STABLE,
+                'demand_level': LEVEL_MEDIUM,
+                'supply_level': LEVEL_MEDIUM,
                 'volatility': 'low',
-                'recommended_action': 'hold'
+                'recommended_action': ACTION_HOLD
             }
             
             # Analyze price trends
-            if len(self.price_history) >= 3:
-                recent_prices = [price for _, price in self.price_history[-3:]]
-                if recent_prices[-1] > recent_prices[0] * 1.05:
-                    analysis['price_trend'] = 'rising'
-                    analysis['recommended_action'] = 'buy'
-                elif recent_prices[-1] < recent_prices[0] * 0.95:
-                    analysis['price_trend'] = 'falling'
-                    analysis['recommended_action'] = 'hold'
+            if self._price_len >= 3:
+                recent_prices = self._recent_prices(3)
+                first_price, last_price = recent_prices[0], recent_prices[-1]
+                if last_price > first_price * 1.05:
+                    analysis['price_trend'] = TREND_RISING
+                    analysis['recommended_action'] = ACTION_BUY
+                elif last_price < first_price * 0.95:
+                    analysis['price_trend'] = TREND_FALLING
+                    analysis['recommended_action'] = ACTION_HOLD
             
             # Consider forecast data
             if self.forecast_data:
@@ -335,66 +640,77 @@ class ConsumerAgent(BaseAgent):
                     demand = demand_forecast['weather_adjusted']
                     
                     if demand > supply * 1.1:
-                        analysis['demand_level'] = 'high'
-                        analysis['recommended_action'] = 'buy'
+                        analysis['demand_level'] = LEVEL_HIGH
+                        analysis['recommended_action'] = ACTION_BUY
                     elif supply > demand * 1.1:
-                        analysis['supply_level'] = 'high'
-                        analysis['recommended_action'] = 'hold'
+                        analysis['supply_level'] = LEVEL_HIGH
+                        analysis['recommended_action'] = ACTION_HOLD
             
             # Consider current consumption and battery level
-            if self.current_consumption > self.consumer_config.base_consumption_mw * 1.1:
-                analysis['demand_level'] = 'high'
-                if analysis['recommended_action'] == 'hold':
-                    analysis['recommended_action'] = 'buy'
+            if self.current_consumption > self._high_consumption_threshold:
+                analysis['demand_level'] = LEVEL_HIGH
+                analysis['recommended_action'] = ACTION_BUY
             
-            if self.battery_level < self.consumer_config.battery_capacity_mwh * 0.3:
-                analysis['recommended_action'] = 'buy'
+            if self.battery_level < self._battery_low_threshold:
+                analysis['recommended_action'] = ACTION_BUY
             
-            self.logger.info("Market analysis completed", analysis=analysis)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Market analysis completed", analysis=analysis)
             return analysis
             
         except Exception as e:
             self.logger.error("Error analyzing market conditions", error=str(e))
-            return {'recommended_action': 'hold'}
+            return {'recommended_action': ACTION_HOLD}
 
-    async def _make_trading_decisions(self, market_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _make_trading_decisions(self, market_analysis: Dict[str, Any]) -> List[TradingDecision]:
         """Make trading decisions based on market analysis."""
         try:
             decisions = []
-            recommended_action = market_analysis.get('recommended_action', 'hold')
+            recommended_action = market_analysis.get('recommended_action', ACTION_HOLD)
             
-            if recommended_action == 'buy':
-                # Calculate optimal buying price
-                optimal_price = await self._calculate_optimal_price(market_analysis)
+            if recommended_action == ACTION_BUY:
+                demand_level = market_analysis.get('demand_level', LEVEL_MEDIUM)
                 
-                # Calculate quantity to buy
-                quantity_to_buy = await self._calculate_quantity_to_buy(market_analysis)
+                # Calculate optimal buying price and quantity
+                optimal_price, quantity_to_buy, action = decide(
+                    self.current_market_price,
+                    demand_level,
+                    market_analysis.get('supply_level', LEVEL_MEDIUM),
+                    market_analysis.get('price_trend', TREND_STABLE),
+                    self.battery_level,
+                    self.consumer_config.battery_capacity_mwh,
+                    self.current_consumption,
+                    self.consumer_config.min_price_per_mwh,
+                    self.consumer_config.max_price_per_mwh,
+                    self._max_bid_quantity
+                )
                 
-                if quantity_to_buy > 0:
-                    decision = {
-                        'action': 'buy',
-                        'quantity_mw': quantity_to_buy,
-                        'price_per_mwh': optimal_price,
-                        'priority': 'high' if market_analysis.get('demand_level') == 'high' else 'medium',
-                        'valid_until': (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
-                    }
+                if action == ACTION_BUY:
+                    decision = TradingDecision(
+                        action='buy',
+                        quantity_mw=quantity_to_buy,
+                        price_per_mwh=optimal_price,
+                        priority='high' if demand_level == LEVEL_HIGH else 'medium',
+                        valid_until_ts=self._now_ts + 30 * 60
+                    )
                     decisions.append(decision)
                     
-                    self.logger.info("Trading decision made", decision=decision)
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info("Trading decision made", decision=decision)
             
-            elif recommended_action == 'hold' and self.consumer_config.peak_shaving_enabled:
+            elif recommended_action == ACTION_HOLD and self.consumer_config.peak_shaving_enabled:
                 # Consider using battery for peak shaving if prices are high
-                if self.current_market_price > self.consumer_config.max_price_per_mwh * 0.8:
-                    decision = {
-                        'action': 'use_battery',
-                        'quantity_mw': min(
+                if self.current_market_price > self._price_high_threshold:
+                    decision = TradingDecision(
+                        action='use_battery',
+                        quantity_mw=min(
                             self.battery_level,
                             self.current_consumption * 0.3
                         ),
-                        'price_per_mwh': self.current_market_price,
-                        'priority': 'medium',
-                        'valid_until': (datetime.now(timezone.utc) + timedelta(minutes=15)).isoformat()
-                    }
+                        price_per_mwh=self.current_market_price,
+                        priority='medium',
+                        valid_until_ts=self._now_ts + 15 * 60
+                    )
                     decisions.append(decision)
             
             return decisions
@@ -403,116 +719,47 @@ class ConsumerAgent(BaseAgent):
             self.logger.error("Error making trading decisions", error=str(e))
             return []
 
-    async def _calculate_optimal_price(self, market_analysis: Dict[str, Any]) -> float:
-        """Calculate optimal buying price based on market conditions."""
+    async def _execute_trading_decisions(self, decisions: List[TradingDecision]):
+        """Execute trading decisions by sending bids to market."""
         try:
-            base_price = self.current_market_price
-            
-            # Adjust based on demand level
-            demand_multiplier = 1.0
-            if market_analysis.get('demand_level') == 'high':
-                demand_multiplier = 1.1
-            elif market_analysis.get('demand_level') == 'low':
-                demand_multiplier = 0.95
-            
-            # Adjust based on supply level
-            supply_multiplier = 1.0
-            if market_analysis.get('supply_level') == 'low':
-                supply_multiplier = 1.05
-            elif market_analysis.get('supply_level') == 'high':
-                supply_multiplier = 0.95
-            
-            # Adjust based on price trend
-            trend_multiplier = 1.0
-            if market_analysis.get('price_trend') == 'rising':
-                trend_multiplier = 1.02
-            elif market_analysis.get('price_trend') == 'falling':
-                trend_multiplier = 0.98
-            
-            # Calculate optimal price
-            optimal_price = base_price * demand_multiplier * supply_multiplier * trend_multiplier
-            
-            # Ensure price is within bounds
-            optimal_price = max(
-                self.consumer_config.min_price_per_mwh,
-                min(optimal_price, self.consumer_config.max_price_per_mwh)
-            )
-            
-            return round(optimal_price, 2)
+            bids_out = []
+            batch_priority = 0
             
-        except Exception as e:
-            self.logger.error("Error calculating optimal price", error=str(e))
-            return self.current_market_price
-
-    async def _calculate_quantity_to_buy(self, market_analysis: Dict[str, Any]) -> float:
-        """Calculate optimal quantity to buy."""
-        try:
-            # Start with current consumption needs
-            base_quantity = self.current_consumption
-            
-            # Adjust based on battery level
-            if self.battery_level < self.consumer_config.battery_capacity_mwh * 0.3:
-                # Need to charge battery
-                base_quantity += (self.consumer_config.battery_capacity_mwh - self.battery_level) * 0.5
-            
-            # Adjust based on market conditions
-            if market_analysis.get('demand_level') == 'high':
-                # Buy more when demand is high
-                base_quantity *= 1.1
-            elif market_analysis.get('demand_level') == 'low':
-                # Buy less when demand is low
-                base_quantity *= 0.9
-            
-            # Adjust based on price trend
-            if market_analysis.get('price_trend') == 'rising':
-                # Buy more if prices are rising
-                base_quantity *= 1.05
-            elif market_analysis.get('price_trend') == 'falling':
-                # Buy less if prices are falling
-                base_quantity *= 0.95
-            
-            # Ensure quantity is reasonable
-            final_quantity = max(0, min(base_quantity, self.consumer_config.max_consumption_mw * 1.5))
-            
-            return round(final_quantity, 2)
+            now_ts = self._now_ts
             
-        except Exception as e:
-            self.logger.error("Error calculating quantity to buy", error=str(e))
-            return 0.0
-
-    async def _execute_trading_decisions(self, decisions: List[Dict[str, Any]]):
-        """Execute trading decisions by sending bids to market."""
-        try:
             for decision in decisions:
-                if decision['action'] == 'buy':
+                if decision.action == 'buy':
                     # Create market bid
-                    bid = {
-                        'bid_id': f"bid_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}",
-                        'consumer_id': self.agent_id,
-                        'quantity_mw': decision['quantity_mw'],
-                        'price_per_mwh': decision['price_per_mwh'],
-                        'priority': decision['priority'],
-                        'valid_until': decision['valid_until'],
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    }
-                    
-                    # Send bid to market supervisor
-                    await self.send_message(
-                        recipient_id='market_supervisor_agent',
-                        message_type='energy_bid',
-                        payload=bid,
-                        priority=decision['priority'] == 'high' and 8 or 5
+                    self._bid_seq += 1
+                    bid = Bid(
+                        bid_id=f"{self._bid_id_prefix}{self._bid_seq}",
+                        consumer_id=self.agent_id,
+                        quantity_mw=decision.quantity_mw,
+                        price_per_mwh=decision.price_per_mwh,
+                        priority=decision.priority,
+                        valid_until_ts=decision.valid_until_ts,
+                        timestamp_ts=now_ts
                     )
                     
-                    # Add to active bids
-                    self.active_bids.append(bid)
+                    # Queue bid for the market supervisor
+                    bids_out.append(bid.to_wire())
+                    batch_priority = max(batch_priority, decision.priority == 'high' and 8 or 5)
+                    
+                    # Add to active bids, tracking expiry on the loop clock
+                    self.active_bids[bid.bid_id] = bid
+                    heapq.heappush(self._bid_expiry_heap,
+                                   (self._now_mono + bid.valid_until_ts - now_ts, bid.bid_id))
                     
-                    self.logger.info("Market bid sent", bid=bid)
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info("Market bid created", 
+                                       bid_id=bid.bid_id,
+                                       quantity_mw=bid.quantity_mw,
+                                       price_per_mwh=bid.price_per_mwh)
                 
-                elif decision['action'] == 'use_battery':
+                elif decision.action == 'use_battery':
                     # Use battery for peak shaving
                     use_amount = min(
-                        decision['quantity_mw'],
+                        decision.quantity_mw,
                         self.battery_level
                     )
                     
@@ -528,32 +775,44 @@ class ConsumerAgent(BaseAgent):
                                   savings=savings,
                                   new_battery_level=self.battery_level)
             
+            # Send all bids from this cycle to the market supervisor at once
+            if bids_out:
+                await self.send_message(
+                    recipient_id='market_supervisor_agent',
+                    message_type='energy_bid_batch',
+                    payload={'bids': bids_out},
+                    priority=batch_priority
+                )
+                
+                self.logger.info("Market bids sent", bid_count=len(bids_out))
+            
         except Exception as e:
             self.logger.error("Error executing trading decisions", error=str(e))
 
     async def _update_market_bids(self):
         """Update and clean up market bids."""
         try:
-            current_time = datetime.now(timezone.utc)
-            expired_bids = []
-            
-            for bid in self.active_bids:
-                valid_until = datetime.fromisoformat(bid['valid_until'])
-                if current_time > valid_until:
-                    expired_bids.append(bid)
+            now = self._now_mono
+            expired_bid_ids = []
             
-            # Remove expired bids
-            for expired_bid in expired_bids:
-                self.active_bids.remove(expired_bid)
+            # Pop expired bids off the expiry heap
+            while self._bid_expiry_heap and self._bid_expiry_heap[0][0] <= now:
+                _, bid_id = heapq.heappop(self._bid_expiry_heap)
                 
-                # Notify market supervisor of expired bid
+                # Bids already traded or rejected are no longer active
+                if self.active_bids.pop(bid_id, None) is None:
+                    continue
+                
+                expired_bid_ids.append(bid_id)
+                self.logger.info("Bid expired", bid_id=bid_id)
+            
+            # Notify market supervisor of all expired bids at once
+            if expired_bid_ids:
                 await self.send_message(
                     recipient_id='market_supervisor_agent',
-                    message_type='bid_expired',
-                    payload={'bid_id': expired_bid['bid_id']}
+                    message_type='bid_expired_batch',
+                    payload={'bid_ids': expired_bid_ids}
                 )
-                
-                self.logger.info("Bid expired", bid_id=expired_bid['bid_id'])
             
         except Exception as e:
             self.logger.error("Error updating market bids", error=str(e))
@@ -561,19 +820,25 @@ class ConsumerAgent(BaseAgent):
     async def _analyze_price_patterns(self) -> Dict[str, Any]:
         """Analyze price patterns for battery optimization."""
         try:
-            if len(self.price_history) < 24:
+            if self._price_len < 24:
                 return {'pattern': 'insufficient_data'}
             
-            # Analyze daily patterns
-            current_hour = datetime.now(timezone.utc).hour
-            daily_prices = []
+            # Analyze daily patterns over the last 24 samples, reusing the
+            # average until a new price arrives or the hour changes
+            current_hour = self._now.hour
+            cache_key = (self._price_version, current_hour)
+            
+            if self._hourly_avg_key != cache_key:
+                recent_prices = self._recent_prices(24)
+                recent_hours = (self._recent_window(self._price_ts, 24) // 3600) % 24
+                same_hour = recent_hours == current_hour
+                
+                self._hourly_avg = float(recent_prices[same_hour].mean()) if same_hour.any() else None
+                self._hourly_avg_key = cache_key
             
-            for timestamp, price in self.price_history[-24:]:
-                if timestamp.hour == current_hour:
-                    daily_prices.append(price)
+            avg_price = self._hourly_avg
             
-            if daily_prices:
-                avg_price = sum(daily_prices) / len(daily_prices)
+            if avg_price is not None:
                 current_price = self.current_market_price
                 
                 if current_price < avg_price * 0.9:
@@ -603,7 +868,7 @@ class ConsumerAgent(BaseAgent):
             
             if pattern == 'low_price_opportunity':
                 # Charge battery when prices are low
-                if self.battery_level < self.consumer_config.battery_capacity_mwh * 0.8:
+                if self.battery_level < self._battery_high_threshold:
                     charge_amount = min(
                         self.consumer_config.battery_capacity_mwh - self.battery_level,
                         self.current_consumption * 0.5
@@ -618,7 +883,7 @@ class ConsumerAgent(BaseAgent):
             
             elif pattern == 'high_price_avoid':
                 # Use battery when prices are high
-                if self.battery_level > self.consumer_config.battery_capacity_mwh * 0.3:
+                if self.battery_level > self._battery_low_threshold:
                     use_amount = min(
                         self.battery_level * 0.2,
                         self.current_consumption * 0.3
@@ -636,19 +901,14 @@ class ConsumerAgent(BaseAgent):
                                       use_amount=use_amount,
                                       savings=savings)
             
-        except Exception as e:
-            self.logger.error("Error optimizing battery usage", error=str(e))
-
-    async def _calculate_energy_savings(self):
-        """Calculate energy cost savings from battery optimization."""
-        try:
-            # Calculate potential savings from not buying at current price
-            if self.battery_level > 0:
-                potential_savings = self.battery_level * self.current_market_price
+            # Track potential savings from not buying at current price
+            battery_level = self.battery_level
+            if battery_level > 0:
+                potential_savings = battery_level * self.current_market_price
                 self.energy_cost_savings = max(self.energy_cost_savings, potential_savings)
             
         except Exception as e:
-            self.logger.error("Error calculating energy savings", error=str(e))
+            self.logger.error("Error optimizing battery usage", error=str(e))
 
     async def _check_demand_response_opportunities(self):
         """Check for demand response opportunities."""
@@ -656,14 +916,13 @@ class ConsumerAgent(BaseAgent):
             # In a real implementation, this would check for grid operator signals
             # For now, we'll simulate based on price thresholds
             
-            if (self.current_market_price > self.consumer_config.max_price_per_mwh * 0.9 and
+            if (self.current_market_price > self._price_dr_threshold and
                 not self.demand_response_active and
-                self.battery_level > self.consumer_config.battery_capacity_mwh * 0.4):
+                self.battery_level > self._battery_dr_threshold):
                 
                 # Activate demand response
-                self.demand_response_active = True
                 self.demand_response_target = self.current_consumption * 0.2
-                self.demand_response_duration = timedelta(minutes=30)
+                self._start_demand_response(timedelta(minutes=30))
                 
                 self.logger.info("Demand response activated", 
                                target_reduction=self.demand_response_target,
@@ -673,11 +932,20 @@ class ConsumerAgent(BaseAgent):
             self.logger.error("Error checking demand response opportunities", error=str(e))
 
     async def _update_demand_response_status(self):
-        """Update demand response status."""
+        """End demand response once its scheduled period has elapsed."""
         try:
+            # Ignore wakeups superseded by an earlier end check
+            wakeup_at = self._demand_response_wakeup_at
+            if wakeup_at is None or self._now_mono < wakeup_at:
+                return
+            self._demand_response_wakeup_at = None
+            
             if self.demand_response_active:
-                # Check if demand response period has ended
-                if self.demand_response_duration <= timedelta(0):
+                if self._now_mono < self._demand_response_ends_at:
+                    # A newer signal extended the period; check again when it ends
+                    self._demand_response_wakeup_at = self._demand_response_ends_at
+                    self._schedule_task('demand_response_end', self._demand_response_ends_at - self._now_mono)
+                else:
                     # End demand response
                     self.demand_response_active = False
                     self.demand_response_target = 0.0
@@ -688,68 +956,89 @@ class ConsumerAgent(BaseAgent):
                     self.demand_response_revenue += revenue
                     
                     self.logger.info("Demand response ended", revenue=revenue)
-                else:
-                    # Reduce remaining duration
-                    self.demand_response_duration -= timedelta(minutes=1)
             
         except Exception as e:
             self.logger.error("Error updating demand response status", error=str(e))
 
-    async def _store_consumption_data(self):
-        """Store consumption data in Timestream."""
+    def _store_consumption_data(self):
+        """Buffer consumption data for the next Timestream write."""
+        idx = self._ts_idx
+        if idx >= TIMESTREAM_FLUSH_MAX_ROWS:
+            # The flush loop has not drained the buffer yet
+            self.logger.warning("Timestream buffer full, dropping consumption sample")
+            return
+        
+        # Store consumption metrics
+        cols = self._measure_cols
+        cols['factory_consumption'][idx] = self.current_consumption
+        cols['battery_level'][idx] = self.battery_level
+        cols['available_battery_capacity'][idx] = self.available_battery_capacity
+        cols['market_price'][idx] = self.current_market_price
+        cols['demand_response_active'][idx] = 1.0 if self.demand_response_active else 0.0
+        self._ts_col[idx] = self._now_ts
+        self._ts_idx = idx + 1
+        
+        # Flush early once the buffer is full
+        if self._ts_idx >= TIMESTREAM_FLUSH_MAX_ROWS:
+            self._request_timeseries_flush()
+
+    def _request_timeseries_flush(self):
+        """Schedule a flush ahead of the regular interval."""
+        if not self._ts_flush_pending and self in ConsumerAgent._instances:
+            self._ts_flush_pending = True
+            self._schedule_task('timestream_flush_now', 0.0)
+
+    async def _flush_timeseries_buffer(self):
+        """Write all buffered records and unwritten purchases to Timestream in one call."""
+        self._ts_flush_pending = False
+        count = self._ts_idx
+        purchase_start = max(self._purchases_flushed, self._purchase_count - self._purchase_capacity)
+        if not count and purchase_start == self._purchase_count:
+            return
+        
+        # Convert the buffered columns to one multi-measure record per tick
+        timestamps = self._ts_col[:count].tolist()
+        columns = [self._measure_cols[name][:count].tolist() for name in CONSUMER_METRICS]
+        records = [
+            {
+                'measure_name': 'consumer_snapshot',
+                'measure_values': dict(zip(CONSUMER_METRICS, values)),
+                'timestamp': timestamp
+            }
+            for timestamp, *values in zip(timestamps, *columns)
+        ]
+        self._ts_idx = 0
+        
+        # Purchases are kept long term in Timestream before the ring buffer overwrites them
+        idx = np.arange(purchase_start, self._purchase_count) % self._purchase_capacity
+        for quantity, price, timestamp in zip(self._purchase_quantities[idx].tolist(),
+                                              self._purchase_prices[idx].tolist(),
+                                              self._purchase_ts[idx].tolist()):
+            records.append({
+                'measure_name': 'consumer_purchase',
+                'measure_values': {'quantity_mw': quantity, 'price_per_mwh': price, 'cost': quantity * price},
+                'timestamp': timestamp
+            })
+        self._purchases_flushed = self._purchase_count
+        
         try:
-            records = []
-            timestamp = datetime.now(timezone.utc)
-            
-            # Store consumption metrics
-            records.extend([
-                {
-                    'measure_name': 'factory_consumption',
-                    'value': self.current_consumption,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'battery_level',
-                    'value': self.battery_level,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'available_battery_capacity',
-                    'value': self.available_battery_capacity,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'market_price',
-                    'value': self.current_market_price,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'demand_response_active',
-                    'value': 1.0 if self.demand_response_active else 0.0,
-                    'timestamp': timestamp
-                }
-            ])
-            
-            if records:
-                await self.store_timeseries_data('consumer_metrics', records)
-                
+            await self.store_timeseries_data('consumer_metrics', records)
         except Exception as e:
             self.logger.error("Error storing consumption data", error=str(e))
 
     async def _process_message(self, message: AgentMessage):
         """Process incoming messages specific to consumer agent."""
-        if message.message_type == "energy_forecast":
-            await self._handle_energy_forecast(message)
-        elif message.message_type == "trade_executed":
-            await self._handle_trade_executed(message)
-        elif message.message_type == "bid_accepted":
-            await self._handle_bid_accepted(message)
-        elif message.message_type == "bid_rejected":
-            await self._handle_bid_rejected(message)
-        elif message.message_type == "demand_response_signal":
-            await self._handle_demand_response_signal(message)
+        handler = self._message_handlers.get(message.message_type)
+        if handler is not None:
+            await handler(message)
         else:
             await super()._process_message(message)
+        
+        # Handlers rarely suspend, so yield periodically to keep bursts from starving other tasks
+        self._msgs_since_yield += 1
+        if self._msgs_since_yield >= MESSAGES_PER_YIELD:
+            self._msgs_since_yield = 0
+            await asyncio.sleep(0)
 
     async def _handle_energy_forecast(self, message: AgentMessage):
         """Handle energy forecasts from forecasting agent."""
@@ -761,31 +1050,60 @@ class ConsumerAgent(BaseAgent):
         except Exception as e:
             self.logger.error("Error handling energy forecast", error=str(e))
 
+    async def _handle_market_performance_report(self, message: AgentMessage):
+        """Record the market clearing price from market performance reports."""
+        try:
+            report = message.payload
+            price = report.get('market_metrics', {}).get('clearing_price')
+            if price is None:
+                return
+            
+            timestamp = report.get('timestamp')
+            observed_at = datetime.fromisoformat(timestamp) if timestamp else datetime.now(timezone.utc)
+            
+            self.current_market_price = float(price)
+            self._push_price(observed_at, self.current_market_price)
+            
+        except Exception as e:
+            self.logger.error("Error handling market performance report", error=str(e))
+
     async def _handle_trade_executed(self, message: AgentMessage):
         """Handle trade execution notifications."""
         try:
             trade = message.payload
             trade_id = trade.get('trade_id')
-            
-            # Add to completed purchases
-            self.completed_purchases.append(trade)
+            bid_id = trade.get('bid_id')
+            quantity = float(trade.get('quantity_mw', 0))
+            price = float(trade.get('price_per_mwh', 0))
+            cost = quantity * price
             
             # Update metrics
-            quantity = trade.get('quantity_mw', 0)
-            price = trade.get('price_per_mwh', 0)
-            cost = quantity * price
+            total_energy, self._total_energy_purchased_c = _kahan_add(
+                self.total_energy_purchased, self._total_energy_purchased_c, quantity)
+            total_cost, self._total_cost_c = _kahan_add(self.total_cost, self._total_cost_c, cost)
+            self.total_energy_purchased = total_energy
+            self.total_cost = total_cost
+            
+            # Add to completed purchases
+            count = self._purchase_count
+            idx = count % self._purchase_capacity
+            self._purchase_quantities[idx] = quantity
+            self._purchase_prices[idx] = price
+            self._purchase_ts[idx] = time.time()
+            self._purchase_count = count = count + 1
             
-            self.total_energy_purchased += quantity
-            self.total_cost += cost
+            # Flush early if purchases are piling up faster than the flush interval
+            if count - self._purchases_flushed >= TIMESTREAM_FLUSH_MAX_ROWS:
+                self._request_timeseries_flush()
             
             # Remove from active bids
-            bid_id = trade.get('bid_id')
-            self.active_bids = [b for b in self.active_bids if b.get('bid_id') != bid_id]
+            self.active_bids.pop(bid_id, None)
             
-            self.logger.info("Trade executed", 
-                           trade_id=trade_id,
-                           cost=cost,
-                           total_cost=self.total_cost)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Trade executed", 
+                               trade_id=trade_id,
+                               cost=cost,
+                               total_cost=total_cost)
             
         except Exception as e:
             self.logger.error("Error handling trade execution", error=str(e))
@@ -809,7 +1127,7 @@ class ConsumerAgent(BaseAgent):
             reason = bid.get('reason', 'unknown')
             
             # Remove from active bids
-            self.active_bids = [b for b in self.active_bids if b.get('bid_id') != bid_id]
+            self.active_bids.pop(bid_id, None)
             
             self.logger.info("Bid rejected", 
                            bid_id=bid_id,
@@ -820,49 +1138,56 @@ class ConsumerAgent(BaseAgent):
 
     async def _handle_demand_response_signal(self, message: AgentMessage):
         """Handle demand response signals from grid operator."""
+        if not self._dr_enabled:
+            return
+        
         try:
             signal = message.payload
             target_reduction = signal.get('target_reduction_mw', 0)
+            if target_reduction <= 0:
+                return
+            
             duration_minutes = signal.get('duration_minutes', 30)
             incentive_rate = signal.get('incentive_rate', 0.1)
             
-            if self.consumer_config.demand_response_enabled and target_reduction > 0:
-                # Activate demand response
-                self.demand_response_active = True
-                self.demand_response_target = min(target_reduction, self.current_consumption * 0.3)
-                self.demand_response_duration = timedelta(minutes=duration_minutes)
-                
-                self.logger.info("Demand response signal received", 
-                               target_reduction=self.demand_response_target,
-                               duration=self.demand_response_duration,
-                               incentive_rate=incentive_rate)
+            # Activate demand response
+            self.demand_response_target = min(
+                target_reduction,
+                self.current_consumption * DEMAND_RESPONSE_MAX_REDUCTION_FRACTION
+            )
+            self._start_demand_response(timedelta(minutes=duration_minutes))
+            
+            self.logger.info("Demand response signal received", 
+                           target_reduction=self.demand_response_target,
+                           duration=self.demand_response_duration,
+                           incentive_rate=incentive_rate)
             
         except Exception as e:
             self.logger.error("Error handling demand response signal", error=str(e))
 
     async def get_status(self) -> Dict[str, Any]:
         """Get consumer agent status."""
+        consumption_status = self._status_template['consumption_status']
+        consumption_status['current_consumption_mw'] = self.current_consumption
+        consumption_status['battery_level_mwh'] = self.battery_level
+        consumption_status['available_battery_capacity_mwh'] = self.available_battery_capacity
+        consumption_status['current_shift'] = self.current_shift
+        consumption_status['demand_response_active'] = self.demand_response_active
+        
+        trading_status = self._status_template['trading_status']
+        trading_status['current_market_price'] = self.current_market_price
+        trading_status['active_bids_count'] = len(self.active_bids)
+        trading_status['completed_purchases_count'] = self._purchase_count
+        trading_status['total_energy_purchased_mwh'] = self.total_energy_purchased
+        trading_status['total_cost'] = self.total_cost
+        
+        optimization_metrics = self._status_template['optimization_metrics']
+        optimization_metrics['energy_cost_savings'] = self.energy_cost_savings
+        optimization_metrics['peak_shaving_savings'] = self.peak_shaving_savings
+        optimization_metrics['demand_response_revenue'] = self.demand_response_revenue
+        optimization_metrics['forecast_data_available'] = self.forecast_data is not None
+        
+        # The template sections are refilled in place, so hand out copies
         status = await super().get_status()
-        status.update({
-            'consumption_status': {
-                'current_consumption_mw': self.current_consumption,
-                'battery_level_mwh': self.battery_level,
-                'available_battery_capacity_mwh': self.available_battery_capacity,
-                'current_shift': self.current_shift,
-                'demand_response_active': self.demand_response_active
-            },
-            'trading_status': {
-                'current_market_price': self.current_market_price,
-                'active_bids_count': len(self.active_bids),
-                'completed_purchases_count': len(self.completed_purchases),
-                'total_energy_purchased_mwh': self.total_energy_purchased,
-                'total_cost': self.total_cost
-            },
-            'optimization_metrics': {
-                'energy_cost_savings': self.energy_cost_savings,
-                'peak_shaving_savings': self.peak_shaving_savings,
-                'demand_response_revenue': self.demand_response_revenue,
-                'forecast_data_available': self.forecast_data is not None
-            }
-        })
+        status.update({name: section.copy() for name, section in self._status_template.items()})
         return status
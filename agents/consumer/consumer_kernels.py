@@ -0,0 +1,96 @@
+"""
+Numeric Kernels for the Consumer Agent
+
+This module holds the pure numeric core of the consumer agent's trading
+decisions. Market conditions are encoded as small integer codes so the
+decision math can be compiled with Numba when it is available.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Demand and supply level codes
+LEVEL_LOW = 0
+LEVEL_MEDIUM = 1
+LEVEL_HIGH = 2
+
+# Price trend codes
+TREND_FALLING = 0
+TREND_STABLE = 1
+TREND_RISING = 2
+
+# Recommended action codes
+ACTION_HOLD = 0
+ACTION_BUY = 1
+
+# Price multipliers indexed by code
+DEMAND_PRICE_MULTIPLIERS = (0.95, 1.0, 1.1)  # low, medium, high
+SUPPLY_PRICE_MULTIPLIERS = (1.05, 1.0, 0.95)  # low, medium, high
+TREND_PRICE_MULTIPLIERS = (0.98, 1.0, 1.02)  # falling, stable, rising
+
+# Combined price multiplier indexed by [demand_code, supply_code, trend_code]
+PRICE_MULTIPLIERS = np.multiply.outer(
+    np.multiply.outer(DEMAND_PRICE_MULTIPLIERS, SUPPLY_PRICE_MULTIPLIERS),
+    TREND_PRICE_MULTIPLIERS
+)
+
+
+@njit(cache=True)
+def decide(price: float, demand_code: int, supply_code: int, trend_code: int,
+           battery_level: float, battery_capacity: float, consumption: float,
+           min_price: float, max_price: float, max_quantity: float) -> Tuple[float, float, int]:
+    """
+    Calculate the optimal buying price and quantity for a buy decision.
+
+    Args:
+        price: Current market price ($/MWh)
+        demand_code: Demand level code (LEVEL_*)
+        supply_code: Supply level code (LEVEL_*)
+        trend_code: Price trend code (TREND_*)
+        battery_level: Current battery level (MWh)
+        battery_capacity: Battery storage capacity (MWh)
+        consumption: Current consumption (MW)
+        min_price: Minimum price willing to pay ($/MWh)
+        max_price: Maximum price willing to pay ($/MWh)
+        max_quantity: Maximum quantity to buy (MW)
+
+    Returns:
+        Tuple of (optimal price, quantity, action code)
+    """
+    # Adjust price for demand level, supply level and price trend
+    optimal_price = price * PRICE_MULTIPLIERS[demand_code, supply_code, trend_code]
+    optimal_price = max(min_price, min(optimal_price, max_price))
+
+    # Start with current consumption needs
+    quantity = consumption
+
+    # Charge the battery when it is low
+    if battery_level < battery_capacity * 0.3:
+        quantity += (battery_capacity - battery_level) * 0.5
+
+    # Buy more when demand is high, less when it is low
+    if demand_code == LEVEL_HIGH:
+        quantity *= 1.1
+    elif demand_code == LEVEL_LOW:
+        quantity *= 0.9
+
+    # Buy more if prices are rising, less if they are falling
+    if trend_code == TREND_RISING:
+        quantity *= 1.05
+    elif trend_code == TREND_FALLING:
+        quantity *= 0.95
+
+    quantity = round(max(0.0, min(quantity, max_quantity)), 2)
+
+    action_code = ACTION_BUY if quantity > 0 else ACTION_HOLD
+    return round(optimal_price, 2), quantity, action_code
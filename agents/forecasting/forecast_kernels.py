@@ -0,0 +1,77 @@
+"""
+Numeric Kernels for the Forecasting Agent
+
+This module holds the pure numeric core of the forecasting agent's
+statistical forecasts. Inputs and outputs are plain floats so the
+forecast math can be compiled with Numba when it is available.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Confidence interval bounds as multiples of the (supply, demand, price) baselines: rows are (low, high)
+STATISTICAL_INTERVAL_BOUNDS = np.array([[0.8, 0.8, 0.7], [1.2, 1.2, 1.3]])
+
+
+@njit(cache=True)
+def weather_adjustment(cloud_cover: float, temperature: float) -> float:
+    """
+    Calculate the weather adjustment factor for forecasts.
+
+    Args:
+        cloud_cover: Cloud cover fraction (0-1)
+        temperature: Air temperature (°C)
+
+    Returns:
+        Weather adjustment factor
+    """
+    # Clouds reduce solar output
+    solar_adjustment = 1.0 - (cloud_cover * 0.3)
+
+    # Hot and cold weather both increase demand
+    temp_adjustment = 1.0
+    if temperature > 25:
+        temp_adjustment = 1.1
+    elif temperature < 10:
+        temp_adjustment = 1.05
+
+    return (solar_adjustment + temp_adjustment) / 2
+
+
+@njit(cache=True)
+def statistical_forecast(supply: float, demand: float, price: float,
+                         adjustment: float) -> Tuple[float, float, float, float, float,
+                                                     float, float, float, float]:
+    """
+    Calculate adjusted values and confidence intervals from historical baselines.
+
+    Args:
+        supply: Baseline supply (MW)
+        demand: Baseline demand (MW)
+        price: Baseline price ($/MWh)
+        adjustment: Weather adjustment factor
+
+    Returns:
+        Tuple of (weather-adjusted supply, weather-adjusted demand, projected price,
+        supply low, supply high, demand low, demand high, price low, price high)
+    """
+    supply_adjusted = supply * adjustment
+    demand_adjusted = demand * (2 - adjustment)  # Inverse relationship
+    price_projected = price * (demand / supply)
+
+    low = STATISTICAL_INTERVAL_BOUNDS[0]
+    high = STATISTICAL_INTERVAL_BOUNDS[1]
+    return (supply_adjusted, demand_adjusted, price_projected,
+            supply * low[0], supply * high[0],
+            demand * low[1], demand * high[1],
+            price * low[2], price * high[2])
@@ -7,12 +7,59 @@ and external data sources. It communicates forecasts to other agents via A2A.
 
 import asyncio
 import json
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
 
 from ..base_agent import BaseAgent, AgentConfig, AgentMessage
+from .forecast_kernels import statistical_forecast, weather_adjustment
+
+
+# Retention window for historical data
+HISTORICAL_DATA_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Weather data older than this when the ML model is called is refreshed alongside the call
+WEATHER_PREFETCH_AGE_SECONDS = 240.0
+
+# ML model calls time out after this long
+ML_CALL_TIMEOUT_SECONDS = 10.0
+
+# After this many consecutive ML failures, skip the model for ML_CIRCUIT_OPEN_SECONDS
+ML_CIRCUIT_FAILURE_THRESHOLD = 3
+ML_CIRCUIT_OPEN_SECONDS = 60.0
+
+# Upper bound on retained historical rows (7 days at 1-minute resolution)
+HISTORICAL_DATA_MAX_ROWS = 7 * 24 * 60
+
+# Baseline confidence interval bounds as multiples of the (supply, demand, price) baselines: rows are (low, high)
+BASELINE_INTERVAL_BOUNDS = np.array([[0.6, 0.6, 0.5], [1.4, 1.4, 1.5]])
+
+# Data quality flags; each flag set adds 0.1 to forecast confidence
+DATA_QUALITY_WEATHER = 0b01  # Weather forecast points available
+DATA_QUALITY_HISTORY = 0b10  # More than a day of historical records
+
+# Stored forecast values as (measure name, forecast section, field)
+FORECAST_METRIC_FIELDS = (
+    ('supply_forecast', 'supply_forecast', 'weather_adjusted'),
+    ('demand_forecast', 'demand_forecast', 'weather_adjusted'),
+    ('price_forecast', 'price_forecast', 'projected'),
+)
+
+# Confidence bonus by forecast generation method
+GENERATION_METHOD_CONFIDENCE = {'ml_model': 0.3, 'statistical_fallback': 0.1}
+
+
+@lru_cache(maxsize=64)
+def _weather_adjustment_quantized(cloud_cover_pct: int, temperature: int) -> float:
+    """Weather adjustment for cloud cover (%) and temperature (°C) rounded to whole units."""
+    return weather_adjustment(cloud_cover_pct / 100.0, float(temperature))
 
 
 class ForecastingAgentConfig(AgentConfig):
@@ -23,6 +70,65 @@ class ForecastingAgentConfig(AgentConfig):
     ml_model_endpoint: str = "energy-forecasting-model"
     weather_api_tool: str = "weather-forecast"
     historical_data_tool: str = "historical-energy-data"
+    history_cache_enable: bool = False
+    history_cache_path: str = "cache/forecasting_history.parquet"
+
+
+@dataclass
+class ForecastSummary:
+    """Headline values of a generated forecast, kept in the forecast history."""
+    __slots__ = ('forecast_id', 'timestamp_ts', 'generation_method', 'confidence_score',
+                 'supply_baseline', 'supply_adjusted', 'demand_baseline', 'demand_adjusted',
+                 'price_baseline', 'price_projected')
+    forecast_id: str
+    timestamp_ts: float  # Epoch seconds
+    generation_method: str
+    confidence_score: float
+    supply_baseline: float
+    supply_adjusted: float  # Weather- or time-adjusted supply (MW)
+    demand_baseline: float
+    demand_adjusted: float  # Weather- or time-adjusted demand (MW)
+    price_baseline: float
+    price_projected: float
+
+    @classmethod
+    def from_forecast(cls, forecast: Dict[str, Any], timestamp_ts: float) -> 'ForecastSummary':
+        """Summarize a forecast payload; missing values become NaN."""
+        supply = forecast.get('supply_forecast') or {}
+        demand = forecast.get('demand_forecast') or {}
+        price = forecast.get('price_forecast') or {}
+        return cls(
+            forecast_id=forecast.get('forecast_id', ''),
+            timestamp_ts=timestamp_ts,
+            generation_method=forecast.get('generation_method', 'unknown'),
+            confidence_score=forecast.get('confidence_score', 0.0),
+            supply_baseline=supply.get('baseline', math.nan),
+            supply_adjusted=supply.get('weather_adjusted', supply.get('time_adjusted', math.nan)),
+            demand_baseline=demand.get('baseline', math.nan),
+            demand_adjusted=demand.get('weather_adjusted', demand.get('time_adjusted', math.nan)),
+            price_baseline=price.get('baseline', math.nan),
+            price_projected=price.get('projected', math.nan)
+        )
+
+
+class HistoryCache:
+    """Parquet file that keeps the historical data frame across agent restarts."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """Load the cached frame, or None if nothing has been cached yet."""
+        if not self.path.exists():
+            return None
+        return pd.read_parquet(self.path)
+
+    def save(self, frame: pd.DataFrame):
+        """Write the frame, replacing the previous cache atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        frame.to_parquet(tmp_path, index=False)
+        tmp_path.replace(self.path)
 
 
 class ForecastingAgent(BaseAgent):
@@ -39,18 +145,48 @@ class ForecastingAgent(BaseAgent):
         
         # Forecasting state
         self.current_forecast: Optional[Dict[str, Any]] = None
-        self.forecast_history: List[Dict[str, Any]] = []
+        self.forecast_history: deque = deque(maxlen=100)  # Recent ForecastSummary entries
+        
+        # Confidence scores of recent forecasts, updated in lockstep with forecast_history
+        self._confidence_ring = np.zeros(self.forecast_history.maxlen, dtype=np.float32)
+        self._ring_idx: int = 0
         self.last_forecast_update: Optional[datetime] = None
         
+        # Forecast IDs combine the forecast time with a per-process sequence
+        self._forecast_seq: int = 0
+        
         # ML model state
         self.model_loaded = False
         self.model_performance_metrics: Dict[str, float] = {}
         
+        # ML call circuit breaker: consecutive failures and time.monotonic() until which calls are skipped
+        self._ml_fail_count: int = 0
+        self._ml_circuit_open_until: float = 0.0
+        self._perf_bonus: float = 0.0  # Confidence bonus from model performance metrics
+        
+        # DATA_QUALITY_* flags, updated when the underlying data is fetched
+        self._data_quality_bits: int = 0
+        
         # External data sources
         self.weather_data: Optional[Dict[str, Any]] = None
+        self._weather_fetched_at: float = 0.0  # time.monotonic() of the last successful fetch
+        self._weather_adjustment_cache: Tuple[Optional[Dict[str, Any]], float] = (None, 1.0)  # (weather_data, adjustment)
         self.historical_data: Optional[pd.DataFrame] = None
+        self._history_cache: Optional[HistoryCache] = (
+            HistoryCache(config.history_cache_path) if config.history_cache_enable else None
+        )
         
-        self.logger.info("Forecasting Agent initialized", config=config.dict())
+        # Hour of day and day of week per historical row, derived once at ingestion
+        self._historical_hour: np.ndarray = np.empty(0, dtype=np.uint8)
+        self._historical_dow: np.ndarray = np.empty(0, dtype=np.uint8)
+        
+        # Mean (supply, demand, price) per (hour, day_of_week), rebuilt when historical data is fetched
+        self._hod_means: Dict[Tuple[int, int], Tuple[float, float, float]] = {}
+        
+        # In-flight on-demand forecasts keyed by horizon, shared by concurrent requests
+        self._inflight_forecasts: Dict[int, asyncio.Future] = {}
+        
+        self.logger.info("Forecasting Agent initialized")
 
     async def _start_agent_specific(self):
         """Start forecasting-specific tasks."""
@@ -67,6 +203,7 @@ class ForecastingAgent(BaseAgent):
 
     async def _stop_agent_specific(self):
         """Stop forecasting-specific tasks."""
+        await self._save_history_cache()
         self.logger.info("Forecasting Agent stopped")
 
     async def _load_ml_model(self):
@@ -88,11 +225,15 @@ class ForecastingAgent(BaseAgent):
                 # Generate new forecast
                 await self._generate_forecast()
                 
-                # Broadcast forecast to other agents
-                await self._broadcast_forecast()
-                
-                # Store forecast in Timestream
-                await self._store_forecast_data()
+                # Broadcast forecast to other agents and store it in Timestream
+                results = await asyncio.gather(
+                    self._broadcast_forecast(),
+                    self._store_forecast_data(),
+                    return_exceptions=True
+                )
+                for step, result in zip(('broadcast', 'store'), results):
+                    if isinstance(result, Exception):
+                        self.logger.error("Error publishing forecast", step=step, error=str(result))
                 
                 # Wait for next update
                 await asyncio.sleep(self.forecast_config.update_interval_minutes * 60)
@@ -105,11 +246,15 @@ class ForecastingAgent(BaseAgent):
         """Loop for ingesting external data sources."""
         while self.is_running:
             try:
-                # Fetch weather data
-                await self._fetch_weather_data()
-                
-                # Fetch historical energy data
-                await self._fetch_historical_data()
+                # Fetch weather data and historical energy data
+                results = await asyncio.gather(
+                    self._fetch_weather_data(),
+                    self._fetch_historical_data(),
+                    return_exceptions=True
+                )
+                for source, result in zip(('weather', 'historical'), results):
+                    if isinstance(result, Exception):
+                        self.logger.error("Error ingesting data", source=source, error=str(result))
                 
                 # Wait before next update
                 await asyncio.sleep(300)  # 5 minutes
@@ -118,58 +263,91 @@ class ForecastingAgent(BaseAgent):
                 self.logger.error("Error in data ingestion loop", error=str(e))
                 await asyncio.sleep(60)
 
-    async def _generate_forecast(self):
-        """Generate a new energy forecast."""
+    async def _generate_forecast(self, horizon: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Generate a new energy forecast.
+        
+        Without a horizon, the forecast covers the configured horizon and is published as
+        current_forecast. Forecasts for an explicit horizon are only returned to the caller.
+        """
+        publish = horizon is None
+        if publish:
+            horizon = self.forecast_config.forecast_horizon_hours
+        
+        # Clock for this forecast only; on-demand forecasts may run alongside the periodic one
+        now = datetime.now(timezone.utc)
+        
         try:
             if not self.model_loaded:
                 self.logger.warning("ML model not loaded, using fallback forecasting")
-                forecast = await self._generate_fallback_forecast()
+                forecast = await self._generate_fallback_forecast(now)
             else:
-                forecast = await self._generate_ml_forecast()
+                forecast = await self._generate_ml_forecast(horizon, now)
             
             # Add metadata
-            forecast['timestamp'] = datetime.now(timezone.utc).isoformat()
+            forecast['timestamp'] = now.isoformat()
             forecast['agent_id'] = self.agent_id
             forecast['confidence_score'] = self._calculate_confidence(forecast)
             
-            # Update current forecast
-            self.current_forecast = forecast
-            self.forecast_history.append(forecast)
-            self.last_forecast_update = datetime.now(timezone.utc)
-            
-            # Keep only recent forecasts
-            if len(self.forecast_history) > 100:
-                self.forecast_history = self.forecast_history[-100:]
+            if publish:
+                # Update current forecast
+                self.current_forecast = forecast
+                self.last_forecast_update = now
+                self.forecast_history.append(ForecastSummary.from_forecast(forecast, now.timestamp()))
+                self._confidence_ring[self._ring_idx % len(self._confidence_ring)] = forecast['confidence_score']
+                self._ring_idx += 1
             
             self.logger.info("New forecast generated", 
                            forecast_id=forecast.get('forecast_id'),
+                           horizon=horizon,
                            confidence=forecast.get('confidence_score'))
+            return forecast
             
         except Exception as e:
             self.logger.error("Error generating forecast", error=str(e))
             # Use last known forecast if available
             if self.current_forecast:
                 self.logger.info("Using previous forecast due to error")
+            return self.current_forecast
+
+    def _next_forecast_id(self, prefix: str, now: datetime) -> str:
+        """Return a unique forecast ID for the given forecast time."""
+        self._forecast_seq += 1
+        return f"{prefix}_{int(now.timestamp())}_{self._forecast_seq}"
 
-    async def _generate_ml_forecast(self) -> Dict[str, Any]:
+    async def _generate_ml_forecast(self, horizon: int, now: datetime) -> Dict[str, Any]:
         """Generate forecast using ML model."""
+        if time.monotonic() < self._ml_circuit_open_until:
+            # The model failed repeatedly; skip it until the circuit closes
+            return await self._generate_fallback_forecast(now)
+        
         try:
             # Prepare input data
-            input_data = await self._prepare_forecast_inputs()
-            
-            # Call ML model via MCP
-            model_response = await self.call_mcp_tool(
-                self.forecast_config.ml_model_endpoint,
-                {
-                    'input_data': input_data,
-                    'forecast_horizon': self.forecast_config.forecast_horizon_hours,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
+            now_iso = now.isoformat()
+            input_data = await self._prepare_forecast_inputs(horizon, now_iso)
+            
+            # Call ML model via MCP, refreshing stale weather data for the next tick meanwhile
+            model_call = asyncio.wait_for(
+                self.call_mcp_tool(
+                    self.forecast_config.ml_model_endpoint,
+                    {
+                        'input_data': input_data,
+                        'forecast_horizon': horizon,
+                        'timestamp': now_iso
+                    }
+                ),
+                timeout=ML_CALL_TIMEOUT_SECONDS
             )
+            if time.monotonic() - self._weather_fetched_at > WEATHER_PREFETCH_AGE_SECONDS:
+                model_response, _ = await asyncio.gather(model_call, self._fetch_weather_data())
+            else:
+                model_response = await model_call
+            
+            self._ml_fail_count = 0
             
             # Process model response
             forecast = {
-                'forecast_id': f"fc_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                'forecast_id': self._next_forecast_id('fc', now),
                 'supply_forecast': model_response.get('supply_forecast', {}),
                 'demand_forecast': model_response.get('demand_forecast', {}),
                 'price_forecast': model_response.get('price_forecast', {}),
@@ -180,64 +358,76 @@ class ForecastingAgent(BaseAgent):
             
             return forecast
             
+        except asyncio.TimeoutError:
+            self.logger.error("ML model call timed out", timeout=ML_CALL_TIMEOUT_SECONDS)
+            self._record_ml_failure()
+            return await self._generate_fallback_forecast(now)
         except Exception as e:
             self.logger.error("Error in ML forecasting", error=str(e))
+            self._record_ml_failure()
             # Fall back to statistical forecasting
-            return await self._generate_fallback_forecast()
+            return await self._generate_fallback_forecast(now)
+
+    def _record_ml_failure(self):
+        """Count an ML failure, opening the circuit once the threshold is reached."""
+        self._ml_fail_count += 1
+        if self._ml_fail_count >= ML_CIRCUIT_FAILURE_THRESHOLD:
+            self._ml_circuit_open_until = time.monotonic() + ML_CIRCUIT_OPEN_SECONDS
+            self._ml_fail_count = 0
+            self.logger.warning("ML model circuit opened", open_seconds=ML_CIRCUIT_OPEN_SECONDS)
 
-    async def _generate_fallback_forecast(self) -> Dict[str, Any]:
+    async def _generate_fallback_forecast(self, now: datetime) -> Dict[str, Any]:
         """Generate forecast using statistical methods when ML model fails."""
         try:
             # Simple time-series forecasting using historical patterns
             if self.historical_data is not None and not self.historical_data.empty:
-                forecast = await self._statistical_forecast()
+                forecast = await self._statistical_forecast(now)
             else:
-                forecast = await self._baseline_forecast()
+                forecast = await self._baseline_forecast(now)
             
             forecast['generation_method'] = 'statistical_fallback'
             return forecast
             
         except Exception as e:
             self.logger.error("Error in fallback forecasting", error=str(e))
-            return await self._baseline_forecast()
+            return await self._baseline_forecast(now)
 
-    async def _statistical_forecast(self) -> Dict[str, Any]:
+    async def _statistical_forecast(self, now: datetime) -> Dict[str, Any]:
         """Generate forecast using statistical methods."""
         # Simple moving average with seasonal adjustment
-        current_hour = datetime.now().hour
-        current_day = datetime.now().weekday()
+        current_hour = now.hour
+        current_day = now.weekday()
         
-        # Get historical data for similar time periods
-        similar_data = self.historical_data[
-            (self.historical_data['hour'] == current_hour) &
-            (self.historical_data['day_of_week'] == current_day)
-        ]
+        # Get historical baselines for similar time periods
+        baselines = self._hod_means.get((current_hour, current_day))
         
-        if len(similar_data) > 0:
-            # Calculate baseline from historical data
-            baseline_supply = similar_data['supply'].mean()
-            baseline_demand = similar_data['demand'].mean()
-            baseline_price = similar_data['price'].mean()
-            
-            # Apply weather adjustments
-            weather_adjustment = self._calculate_weather_adjustment()
+        if baselines is not None:
+            baseline_supply, baseline_demand, baseline_price = baselines
+            
+            # Apply weather adjustments and confidence intervals in the compiled kernel
+            (supply_adjusted, demand_adjusted, price_projected,
+             supply_low, supply_high, demand_low, demand_high,
+             price_low, price_high) = statistical_forecast(
+                baseline_supply, baseline_demand, baseline_price,
+                self._calculate_weather_adjustment()
+            )
             
             forecast = {
-                'forecast_id': f"fc_stat_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                'forecast_id': self._next_forecast_id('fc_stat', now),
                 'supply_forecast': {
                     'baseline': baseline_supply,
-                    'weather_adjusted': baseline_supply * weather_adjustment,
-                    'confidence_interval': [baseline_supply * 0.8, baseline_supply * 1.2]
+                    'weather_adjusted': supply_adjusted,
+                    'confidence_interval': [supply_low, supply_high]
                 },
                 'demand_forecast': {
                     'baseline': baseline_demand,
-                    'weather_adjusted': baseline_demand * (2 - weather_adjustment),  # Inverse relationship
-                    'confidence_interval': [baseline_demand * 0.8, baseline_demand * 1.2]
+                    'weather_adjusted': demand_adjusted,
+                    'confidence_interval': [demand_low, demand_high]
                 },
                 'price_forecast': {
                     'baseline': baseline_price,
-                    'projected': baseline_price * (baseline_demand / baseline_supply),
-                    'confidence_interval': [baseline_price * 0.7, baseline_price * 1.3]
+                    'projected': price_projected,
+                    'confidence_interval': [price_low, price_high]
                 },
                 'weather_factors': self.weather_data or {},
                 'model_version': 'statistical_v1'
@@ -245,12 +435,12 @@ class ForecastingAgent(BaseAgent):
             
             return forecast
         else:
-            return await self._baseline_forecast()
+            return await self._baseline_forecast(now)
 
-    async def _baseline_forecast(self) -> Dict[str, Any]:
+    async def _baseline_forecast(self, now: datetime) -> Dict[str, Any]:
         """Generate baseline forecast when no historical data is available."""
         # Simple baseline based on time of day
-        current_hour = datetime.now().hour
+        current_hour = now.hour
         
         # Typical daily patterns
         if 6 <= current_hour <= 18:  # Daytime
@@ -264,22 +454,27 @@ class ForecastingAgent(BaseAgent):
         baseline_demand = 900   # MW
         baseline_price = 50     # $/MWh
         
+        # Confidence intervals for all three baselines at once
+        supply_interval, demand_interval, price_interval = (
+            np.array([baseline_supply, baseline_demand, baseline_price]) * BASELINE_INTERVAL_BOUNDS
+        ).T.tolist()
+        
         forecast = {
-            'forecast_id': f"fc_base_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'forecast_id': self._next_forecast_id('fc_base', now),
             'supply_forecast': {
                 'baseline': baseline_supply,
                 'time_adjusted': baseline_supply * supply_multiplier,
-                'confidence_interval': [baseline_supply * 0.6, baseline_supply * 1.4]
+                'confidence_interval': supply_interval
             },
             'demand_forecast': {
                 'baseline': baseline_demand,
                 'time_adjusted': baseline_demand * demand_multiplier,
-                'confidence_interval': [baseline_demand * 0.6, baseline_demand * 1.4]
+                'confidence_interval': demand_interval
             },
             'price_forecast': {
                 'baseline': baseline_price,
                 'projected': baseline_price * (demand_multiplier / supply_multiplier),
-                'confidence_interval': [baseline_price * 0.5, baseline_price * 1.5]
+                'confidence_interval': price_interval
             },
             'weather_factors': {},
             'model_version': 'baseline_v1'
@@ -287,11 +482,11 @@ class ForecastingAgent(BaseAgent):
         
         return forecast
 
-    async def _prepare_forecast_inputs(self) -> Dict[str, Any]:
+    async def _prepare_forecast_inputs(self, horizon: int, timestamp: str) -> Dict[str, Any]:
         """Prepare input data for ML model."""
         inputs = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'forecast_horizon': self.forecast_config.forecast_horizon_hours
+            'timestamp': timestamp,
+            'forecast_horizon': horizon
         }
         
         # Add weather data if available
@@ -300,9 +495,9 @@ class ForecastingAgent(BaseAgent):
         
         # Add historical data if available
         if self.historical_data is not None and not self.historical_data.empty:
-            # Get recent historical data
+            # Get recent historical data as columns rather than per-row records
             recent_data = self.historical_data.tail(24)  # Last 24 hours
-            inputs['historical'] = recent_data.to_dict('records')
+            inputs['historical'] = {column: recent_data[column].tolist() for column in recent_data.columns}
         
         return inputs
 
@@ -318,6 +513,11 @@ class ForecastingAgent(BaseAgent):
             )
             
             self.weather_data = weather_response
+            self._weather_fetched_at = time.monotonic()
+            if weather_response.get('forecast'):
+                self._data_quality_bits |= DATA_QUALITY_WEATHER
+            else:
+                self._data_quality_bits &= ~DATA_QUALITY_WEATHER
             self.logger.info("Weather data updated", 
                            data_points=len(weather_response.get('forecast', [])))
             
@@ -325,83 +525,121 @@ class ForecastingAgent(BaseAgent):
             self.logger.error("Error fetching weather data", error=str(e))
 
     async def _fetch_historical_data(self):
-        """Fetch historical energy data using MCP tool."""
+        """Fetch historical energy data, topping up the cached frame with new rows only."""
         try:
-            # Query last 7 days of data from Timestream
-            query = """
+            cached = self.historical_data
+            if cached is None and self._history_cache is not None:
+                try:
+                    cached = await asyncio.to_thread(self._history_cache.load)
+                except Exception as e:
+                    self.logger.warning("Error loading history cache", error=str(e))
+            if cached is not None and cached.empty:
+                cached = None
+            
+            # Query the last 7 days of data from Timestream, skipping rows we already hold
+            since = f"AND time > from_nanoseconds({cached['time'].max().value})" if cached is not None else ""
+            query = f"""
             SELECT time, measure_value::double as value, measure_name
             FROM energy_demo.energy_metrics
-            WHERE time > ago(7d)
+            WHERE time > ago(7d) {since}
             ORDER BY time DESC
             """
             
-            results = await self.query_timeseries_data(query)
+            columns = await self.query_timeseries_columns(query)
+            new_rows = len(columns.get('time', ()))
             
-            if results:
-                # Convert to DataFrame
-                df = pd.DataFrame(results)
-                df['time'] = pd.to_datetime(df['time'])
-                df['hour'] = df['time'].dt.hour
-                df['day_of_week'] = df['time'].dt.dayofweek
-                
-                # Pivot to get supply, demand, and price
-                pivoted = df.pivot_table(
-                    index=['time', 'hour', 'day_of_week'],
-                    columns='measure_name',
-                    values='value',
-                    aggfunc='mean'
-                ).reset_index()
+            if not new_rows and cached is self.historical_data:
+                return
+            
+            frames = []
+            if cached is not None:
+                frames.append(cached.drop(columns=['hour', 'day_of_week']))
+            if new_rows:
+                # Timestream returns scalar values as strings
+                values = pd.to_numeric(pd.Series(columns['value']), errors='coerce').astype(np.float32)
                 
-                self.historical_data = pivoted
-                self.logger.info("Historical data updated", 
-                               records=len(pivoted))
+                # Pivot to get supply, demand, and price per timestamp
+                frames.append(values.groupby(
+                    [pd.to_datetime(pd.Series(columns['time'], name='time')),
+                     pd.Series(columns['measure_name'], name='measure_name')]
+                ).mean().unstack('measure_name').reset_index())
+            pivoted = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            
+            # Drop rows past the retention window, keeping at most the most recent rows
+            epoch_seconds = pivoted['time'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+            keep = epoch_seconds > time.time() - HISTORICAL_DATA_MAX_AGE_SECONDS
+            keep[:-HISTORICAL_DATA_MAX_ROWS] = False
+            if not keep.all():
+                pivoted = pivoted[keep].reset_index(drop=True)
+                epoch_seconds = epoch_seconds[keep]
+            
+            # Derive calendar fields once per timestamp from epoch seconds (UTC);
+            # 1970-01-01 was a Thursday, weekday 3
+            self._historical_hour = ((epoch_seconds // 3600) % 24).astype(np.uint8)
+            self._historical_dow = ((epoch_seconds // 86400 + 3) % 7).astype(np.uint8)
+            pivoted.insert(1, 'hour', self._historical_hour)
+            pivoted.insert(2, 'day_of_week', self._historical_dow)
+            
+            self.historical_data = pivoted
+            if len(pivoted) > 24:
+                self._data_quality_bits |= DATA_QUALITY_HISTORY
+            else:
+                self._data_quality_bits &= ~DATA_QUALITY_HISTORY
+            
+            # Precompute the seasonal baselines used by statistical forecasts
+            if {'supply', 'demand', 'price'}.issubset(pivoted.columns):
+                means = pivoted.groupby(
+                    [self._historical_hour, self._historical_dow]
+                )[['supply', 'demand', 'price']].mean()
+                means = means.astype(np.float64)  # Baselines end up in JSON payloads
+                self._hod_means = dict(zip(means.index, means.itertuples(index=False, name=None)))
+            else:
+                self._hod_means = {}
+            self.logger.info("Historical data updated", 
+                           records=len(pivoted),
+                           new_records=new_rows)
+            
+            if new_rows:
+                await self._save_history_cache()
             
         except Exception as e:
             self.logger.error("Error fetching historical data", error=str(e))
 
+    async def _save_history_cache(self):
+        """Write the historical data to the disk cache, if enabled."""
+        if self._history_cache is None or self.historical_data is None:
+            return
+        try:
+            await asyncio.to_thread(self._history_cache.save, self.historical_data)
+        except Exception as e:
+            self.logger.warning("Error saving history cache", error=str(e))
+
     def _calculate_weather_adjustment(self) -> float:
         """Calculate weather adjustment factor for forecasts."""
         if not self.weather_data:
             return 1.0
         
+        # Weather data is replaced, not mutated, on each fetch
+        cached_weather, cached_adjustment = self._weather_adjustment_cache
+        if cached_weather is self.weather_data:
+            return cached_adjustment
+        
         # Simple weather adjustment based on solar conditions
         weather = self.weather_data.get('current', {})
-        cloud_cover = weather.get('cloud_cover', 50) / 100.0
-        temperature = weather.get('temperature', 20)
-        
-        # Solar production adjustment
-        solar_adjustment = 1.0 - (cloud_cover * 0.3)  # Clouds reduce solar output
-        
-        # Temperature adjustment for demand
-        temp_adjustment = 1.0
-        if temperature > 25:  # Hot weather increases demand
-            temp_adjustment = 1.1
-        elif temperature < 10:  # Cold weather increases demand
-            temp_adjustment = 1.05
-        
-        return (solar_adjustment + temp_adjustment) / 2
+        adjustment = _weather_adjustment_quantized(
+            round(weather.get('cloud_cover', 50)),
+            round(weather.get('temperature', 20))
+        )
+        self._weather_adjustment_cache = (self.weather_data, adjustment)
+        return adjustment
 
     def _calculate_confidence(self, forecast: Dict[str, Any]) -> float:
         """Calculate confidence score for the forecast."""
-        confidence = 0.5  # Base confidence
-        
-        # Adjust based on generation method
-        if forecast.get('generation_method') == 'ml_model':
-            confidence += 0.3
-        elif forecast.get('generation_method') == 'statistical_fallback':
-            confidence += 0.1
-        
-        # Adjust based on data quality
-        if self.weather_data and len(self.weather_data.get('forecast', [])) > 0:
-            confidence += 0.1
-        
-        if self.historical_data is not None and len(self.historical_data) > 24:
-            confidence += 0.1
-        
-        # Adjust based on model performance
-        if self.model_performance_metrics:
-            avg_accuracy = self.model_performance_metrics.get('average_accuracy', 0.5)
-            confidence += avg_accuracy * 0.2
+        # Base confidence, adjusted by generation method, data quality and model performance
+        confidence = (0.5
+                      + GENERATION_METHOD_CONFIDENCE.get(forecast.get('generation_method'), 0.0)
+                      + 0.1 * bin(self._data_quality_bits).count('1')
+                      + self._perf_bonus)
         
         return min(confidence, 1.0)
 
@@ -419,14 +657,21 @@ class ForecastingAgent(BaseAgent):
                 'market_supervisor_agent'
             ]
             
-            for agent_id in agents_to_notify:
-                await self.send_message(
+            correlation_id = self.current_forecast.get('forecast_id')
+            results = await asyncio.gather(*(
+                self.send_message(
                     recipient_id=agent_id,
                     message_type="energy_forecast",
                     payload=self.current_forecast,
                     priority=5,  # High priority for forecasts
-                    correlation_id=f"fc_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    correlation_id=correlation_id
                 )
+                for agent_id in agents_to_notify
+            ), return_exceptions=True)
+            
+            for agent_id, result in zip(agents_to_notify, results):
+                if isinstance(result, Exception):
+                    self.logger.error("Error sending forecast", recipient_id=agent_id, error=str(result))
             
             self.logger.info("Forecast broadcasted", 
                            recipient_count=len(agents_to_notify))
@@ -440,45 +685,22 @@ class ForecastingAgent(BaseAgent):
             return
         
         try:
-            records = []
-            timestamp = datetime.now(timezone.utc)
-            
-            # Store supply forecast
-            supply = self.current_forecast.get('supply_forecast', {})
-            if 'weather_adjusted' in supply:
-                records.append({
-                    'measure_name': 'supply_forecast',
-                    'value': supply['weather_adjusted'],
-                    'timestamp': timestamp
-                })
-            
-            # Store demand forecast
-            demand = self.current_forecast.get('demand_forecast', {})
-            if 'weather_adjusted' in demand:
-                records.append({
-                    'measure_name': 'demand_forecast',
-                    'value': demand['weather_adjusted'],
-                    'timestamp': timestamp
-                })
-            
-            # Store price forecast
-            price = self.current_forecast.get('price_forecast', {})
-            if 'projected' in price:
-                records.append({
-                    'measure_name': 'price_forecast',
-                    'value': price['projected'],
-                    'timestamp': timestamp
-                })
-            
-            # Store confidence score
+            forecast = self.current_forecast
+            timestamp = self.last_forecast_update.timestamp()
+            
+            # Store supply, demand and price forecasts, then the confidence score
+            records = [
+                {'measure_name': measure_name, 'value': value, 'timestamp': timestamp}
+                for measure_name, section, field in FORECAST_METRIC_FIELDS
+                if (value := forecast.get(section, {}).get(field)) is not None
+            ]
             records.append({
                 'measure_name': 'forecast_confidence',
-                'value': self.current_forecast.get('confidence_score', 0.0),
+                'value': forecast.get('confidence_score', 0.0),
                 'timestamp': timestamp
             })
             
-            if records:
-                await self.store_timeseries_data('forecast_metrics', records)
+            await self.store_timeseries_data('forecast_metrics', records)
                 
         except Exception as e:
             self.logger.error("Error storing forecast data", error=str(e))
@@ -500,22 +722,13 @@ class ForecastingAgent(BaseAgent):
             horizon = request.get('horizon_hours', self.forecast_config.forecast_horizon_hours)
             
             # Generate custom forecast if needed
+            forecast = self.current_forecast
             if forecast_type == 'custom' or horizon != self.forecast_config.forecast_horizon_hours:
-                # Store original config
-                original_horizon = self.forecast_config.forecast_horizon_hours
-                
-                # Temporarily update config
-                self.forecast_config.forecast_horizon_hours = horizon
-                
-                # Generate forecast
-                await self._generate_forecast()
-                
-                # Restore original config
-                self.forecast_config.forecast_horizon_hours = original_horizon
+                forecast = await self._coalesced_forecast(horizon)
             
             # Send forecast response
             response_payload = {
-                'forecast': self.current_forecast,
+                'forecast': forecast,
                 'request_id': request.get('request_id'),
                 'generated_at': datetime.now(timezone.utc).isoformat()
             }
@@ -530,17 +743,35 @@ class ForecastingAgent(BaseAgent):
         except Exception as e:
             self.logger.error("Error handling forecast request", error=str(e))
 
+    async def _coalesced_forecast(self, horizon: int) -> Optional[Dict[str, Any]]:
+        """Generate a forecast for the horizon, sharing it with concurrent requests for the same horizon."""
+        future = self._inflight_forecasts.get(horizon)
+        if future is None:
+            future = asyncio.ensure_future(self._generate_forecast(horizon))
+            self._inflight_forecasts[horizon] = future
+            future.add_done_callback(lambda _: self._inflight_forecasts.pop(horizon, None))
+        
+        # Shield so one cancelled requester does not cancel the forecast for the others
+        return await asyncio.shield(future)
+
     async def _handle_model_performance_update(self, message: AgentMessage):
         """Handle updates to model performance metrics."""
         try:
             metrics = message.payload
             self.model_performance_metrics.update(metrics)
+            self._perf_bonus = self.model_performance_metrics.get('average_accuracy', 0.5) * 0.2
             
             self.logger.info("Model performance updated", metrics=metrics)
             
         except Exception as e:
             self.logger.error("Error updating model performance", error=str(e))
 
+    def _recent_average_confidence(self) -> Optional[float]:
+        """Mean confidence score over the forecasts in forecast_history."""
+        if self._ring_idx == 0:
+            return None
+        return float(self._confidence_ring[:self._ring_idx].mean())
+
     async def get_status(self) -> Dict[str, Any]:
         """Get forecasting agent status."""
         status = await super().get_status()
@@ -549,6 +780,7 @@ class ForecastingAgent(BaseAgent):
                 'current_forecast_id': self.current_forecast.get('forecast_id') if self.current_forecast else None,
                 'last_update': self.last_forecast_update.isoformat() if self.last_forecast_update else None,
                 'forecast_count': len(self.forecast_history),
+                'recent_average_confidence': self._recent_average_confidence(),
                 'model_loaded': self.model_loaded,
                 'confidence_threshold': self.forecast_config.confidence_threshold
             },
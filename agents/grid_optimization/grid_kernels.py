@@ -0,0 +1,64 @@
+"""
+Numeric Kernels for the Grid Optimization Agent
+
+This module holds the pure numeric core of the grid optimization agent's
+stability scoring. Inputs are plain float arrays so the scoring loop can
+be compiled with Numba when it is available.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Column indices of the stability_scores result
+STABILITY_FREQUENCY = 0
+STABILITY_VOLTAGE = 1
+STABILITY_SUPPLY_DEMAND = 2
+STABILITY_OVERALL = 3
+
+
+@njit(cache=True, fastmath=True)
+def stability_scores(frequency: np.ndarray, voltage: np.ndarray, load: np.ndarray, supply: np.ndarray,
+                     inv_frequency_threshold: float, inv_voltage_threshold: float) -> np.ndarray:
+    """
+    Calculate grid stability scores (0-1 scale) for each monitoring tick.
+
+    Args:
+        frequency: Grid frequency per tick (Hz)
+        voltage: Grid voltage per tick (V)
+        load: Grid load per tick (MW)
+        supply: Grid supply per tick (MW)
+        inv_frequency_threshold: 1 / (60 Hz * frequency deviation threshold)
+        inv_voltage_threshold: 1 / (120 V * voltage deviation threshold)
+
+    Returns:
+        Array of shape (ticks, 4) holding the frequency, voltage, supply-demand
+        and overall stability per tick (STABILITY_* columns)
+    """
+    n = frequency.shape[0]
+    scores = np.empty((n, 4))
+    for i in range(n):
+        frequency_stability = max(0.0, 1.0 - abs(frequency[i] - 60.0) * inv_frequency_threshold)
+        voltage_stability = max(0.0, 1.0 - abs(voltage[i] - 120.0) * inv_voltage_threshold)
+
+        # Full supply-demand stability without load
+        supply_demand_stability = 1.0
+        if load[i] > 0:
+            supply_demand_stability = min(1.0, supply[i] / load[i])
+
+        scores[i, STABILITY_FREQUENCY] = frequency_stability
+        scores[i, STABILITY_VOLTAGE] = voltage_stability
+        scores[i, STABILITY_SUPPLY_DEMAND] = supply_demand_stability
+        scores[i, STABILITY_OVERALL] = (
+            frequency_stability * 0.4 +
+            voltage_stability * 0.3 +
+            supply_demand_stability * 0.3
+        )
+    return scores
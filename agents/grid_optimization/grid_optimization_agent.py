@@ -6,12 +6,127 @@ and ensures the energy grid operates efficiently and reliably.
 """
 
 import asyncio
+import heapq
+import itertools
 import json
+import logging
+import math
+import time
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from ..base_agent import BaseAgent, AgentConfig, AgentMessage
+from .grid_kernels import (
+    STABILITY_FREQUENCY, STABILITY_OVERALL, STABILITY_SUPPLY_DEMAND, STABILITY_VOLTAGE,
+    stability_scores
+)
+
+
+# Grid metric series tracked in the history, in column order
+HISTORY_SERIES = ('frequency', 'voltage', 'load', 'stability')
+
+# Time constant of the grid metric moving averages
+HISTORY_EMA_SECONDS = 3600
+
+# Width of a history bucket
+HISTORY_BUCKET_SECONDS = 60
+
+# Control signal templates; copied per signal and filled in with the live grid readings (None fields)
+FREQUENCY_REGULATION_SIGNAL = {
+    'regulation_type': 'frequency',
+    'target_frequency': 60.0,
+    'current_frequency': None,
+    'deviation': None,
+    'priority': 'medium'
+}
+VOLTAGE_CONTROL_SIGNAL = {
+    'control_type': 'voltage',
+    'target_voltage': 120.0,
+    'current_voltage': None,
+    'deviation': None,
+    'priority': 'medium'
+}
+LOAD_BALANCING_SIGNAL = {
+    'balancing_type': 'load',
+    'current_load': None,
+    'current_supply': None,
+    'imbalance': None,
+    'priority': 'medium'
+}
+DEMAND_RESPONSE_SIGNAL = {
+    'target_reduction_mw': None,
+    'duration_minutes': None,
+    'incentive_rate': 0.15,  # 15% incentive
+    'priority': 'high'
+}
+
+# Emergency signal templates; copied per signal and filled in with the live grid readings
+# and the configured emergency response time (None fields)
+EMERGENCY_FREQUENCY_REGULATION_SIGNAL = {
+    'regulation_type': 'emergency_frequency',
+    'target_frequency': 60.0,
+    'current_frequency': None,
+    'deviation': None,
+    'priority': 'emergency',
+    'response_time': None
+}
+EMERGENCY_VOLTAGE_CONTROL_SIGNAL = {
+    'control_type': 'emergency_voltage',
+    'target_voltage': 120.0,
+    'current_voltage': None,
+    'deviation': None,
+    'priority': 'emergency',
+    'response_time': None
+}
+EMERGENCY_DEMAND_RESPONSE_SIGNAL = {
+    'target_reduction_mw': None,
+    'duration_minutes': 15,  # 15 minutes for emergency
+    'incentive_rate': 0.25,  # 25% incentive for emergency
+    'priority': 'emergency',
+    'response_time': None
+}
+EMERGENCY_OPTIMIZATION_SIGNAL = {
+    'optimization_type': 'emergency_all',
+    'algorithms': None,
+    'priority': 'emergency',
+    'response_time': None
+}
+
+# Maximum number of queued outbound messages sent per outbox batch
+OUTBOX_BATCH_SIZE = 64
+
+# Measures of the grid_state Timestream record, in the order _store_grid_data collects them
+GRID_MEASURE_NAMES = (
+    'grid_frequency', 'grid_voltage', 'grid_stability_score', 'grid_load', 'grid_supply',
+    'demand_response_active', 'emergency_mode'
+)
+
+# Longest interval between performance reports while the grid state is unchanged
+PERFORMANCE_REPORT_KEEPALIVE_SECONDS = 3600
+
+# Recipients of grid-wide broadcasts, and of demand response announcements
+BROADCAST_AGENTS = ('forecasting_agent', 'producer_agent', 'consumer_agent', 'market_supervisor_agent')
+DEMAND_RESPONSE_AGENTS = ('consumer_agent', 'market_supervisor_agent')
+
+# Length of a demand response event
+DEMAND_RESPONSE_DURATION_SECONDS = 30 * 60
+
+# Grid issue flags, in corrective-action priority order (configurable thresholds)
+ISSUE_FREQUENCY = 0b001
+ISSUE_VOLTAGE = 0b010
+ISSUE_SUPPLY_DEMAND = 0b100
+
+# Emergency condition flags, in priority order; the lowest set flag names the emergency type
+EMERGENCY_FREQUENCY = 0b0001  # Frequency off nominal by more than 0.5 Hz
+EMERGENCY_VOLTAGE = 0b0010  # Voltage off nominal by more than 10 V
+EMERGENCY_SUPPLY_DEMAND = 0b0100  # Supply below 70% of load
+EMERGENCY_STABILITY = 0b1000  # Stability score below 0.8
+EMERGENCY_TYPES = ('frequency_emergency', 'voltage_emergency', 'supply_demand_emergency', 'stability_emergency')
+
+# Standard deviations of the simulated frequency (Hz), voltage (V), load (MW) and supply (MW) variations
+SIMULATION_SIGMA = np.array([0.1, 2.0, 50.0, 30.0])
 
 
 class GridOptimizationConfig(AgentConfig):
@@ -21,8 +136,10 @@ class GridOptimizationConfig(AgentConfig):
     frequency_deviation_threshold: float = 0.1  # Hz deviation threshold
     voltage_deviation_threshold: float = 0.05  # Voltage deviation threshold
     monitoring_interval_seconds: int = 30  # Grid monitoring frequency
+    monitoring_batch_ticks: int = 1  # Monitoring ticks simulated and evaluated per monitoring cycle
     emergency_response_time_seconds: int = 10  # Emergency response time
     max_demand_response_mw: float = 200.0  # Maximum demand response capacity
+    history_maxlen: int = 1440  # 1-minute history buckets kept (24 hours)
 
 
 class GridOptimizationAgent(BaseAgent):
@@ -47,23 +164,59 @@ class GridOptimizationAgent(BaseAgent):
         self.grid_stability_score: float = 1.0
         self.grid_load: float = 0.0  # MW
         self.grid_supply: float = 0.0  # MW
+        self._sd_ratio: float = math.inf  # Supply/load ratio, refreshed with the metrics; inf without load
+        
+        # Grid metric history (HISTORY_SERIES columns): exponential moving averages per tick,
+        # plus a ring of history_maxlen 1-minute means indexed by minute; minutes without samples are NaN
+        self._history_ema = np.zeros(len(HISTORY_SERIES))
+        self._history_samples: int = 0
+        self._history_buckets = np.full(
+            (max(1, config.history_maxlen), len(HISTORY_SERIES)), np.nan, dtype=np.float32
+        )
+        self._bucket_sum = np.zeros(len(HISTORY_SERIES))
+        self._bucket_count: int = 0
+        self._bucket_minute: int = int(time.monotonic() // HISTORY_BUCKET_SECONDS)
+        
+        # Periodic task intervals in seconds, in start-up order
+        self._task_intervals: Dict[str, float] = {
+            'grid_monitoring': 0.0,  # Follows the monitoring config, set by _update_thresholds
+            'demand_response_coordination': 60.0,  # 1 minute intervals
+            'emergency_monitoring': 10.0,  # 10 second intervals for emergencies
+            'grid_optimization': 300.0,  # 5 minutes
+            'performance_reporting': 600.0  # 10 minutes
+        }
+        
+        self._update_thresholds()
         
-        # Grid metrics
-        self.frequency_history: List[Tuple[datetime, float]] = []
-        self.voltage_history: List[Tuple[datetime, float]] = []
-        self.stability_history: List[Tuple[datetime, float]] = []
-        self.load_history: List[Tuple[datetime, float]] = []
+        # Random source for simulated grid metrics
+        self._rng = np.random.default_rng()
+        
+        # Frequency, voltage, load and supply per tick of the latest monitoring batch, oldest first
+        self._metric_batch: Tuple[np.ndarray, ...] = tuple(
+            np.array([value]) for value in (self.grid_frequency, self.grid_voltage, self.grid_load, self.grid_supply)
+        )
+        self._stability_batch: np.ndarray = np.array([self.grid_stability_score])  # Overall stability per tick
         
         # Demand response state
         self.demand_response_active: bool = False
         self.demand_response_participants: List[str] = []
         self.demand_response_target: float = 0.0
-        self.demand_response_duration: timedelta = timedelta(minutes=0)
+        self._dr_remaining_s: int = 0  # Seconds left in the active demand response event
+        self._dr_signal_key: Optional[Tuple[float, Tuple[str, ...]]] = None  # (target, participants) last signalled
         
         # Emergency state
+        self._emergency_mask: int = 0  # EMERGENCY_* flags for the latest monitoring tick
         self.emergency_mode: bool = False
         self.emergency_type: Optional[str] = None
         self.emergency_start_time: Optional[datetime] = None
+        self._emergency_start_iso: Optional[str] = None  # emergency_start_time.isoformat(), formatted once
+        
+        # Emergency signals collected per recipient as (message_type, payload, priority) until the batch is flushed
+        self._pending_emergency_signals: Dict[str, List[Tuple[str, Dict[str, Any], int]]] = defaultdict(list)
+        
+        # Grid state of the last performance report, and when it was sent (time.monotonic())
+        self._last_report_key: Optional[Tuple[Any, ...]] = None
+        self._last_report_at: float = 0.0
         
         # Grid optimization
         self.optimization_algorithms: List[str] = ['frequency_regulation', 'voltage_control', 'load_balancing']
@@ -74,206 +227,381 @@ class GridOptimizationAgent(BaseAgent):
         self.emergency_response_count: int = 0
         self.demand_response_savings: float = 0.0
         
-        self.logger.info("Grid Optimization Agent initialized", config=config.dict())
+        # Corrective actions indexed by ISSUE_* bit position, emergency actions by emergency type
+        self._corrective_actions = (
+            self._optimize_frequency_regulation,  # Frequency issue - activate frequency regulation
+            self._optimize_voltage_control,  # Voltage issue - activate voltage control
+            self._activate_demand_response  # Supply-demand issue - activate demand response
+        )
+        self._emergency_actions = {
+            'frequency_emergency': self._activate_emergency_frequency_regulation,  # All frequency regulation resources
+            'voltage_emergency': self._activate_emergency_voltage_control,  # All voltage control resources
+            'supply_demand_emergency': self._activate_emergency_demand_response,  # Maximum demand response
+            'stability_emergency': self._activate_emergency_optimization  # All optimization algorithms
+        }
+        
+        # Message handlers keyed by message type
+        self._message_handlers = {
+            'energy_forecast': self._handle_energy_forecast,
+            'market_performance_report': self._handle_market_performance_report,
+            'grid_status_request': self._handle_grid_status_request
+        }
+        
+        # Periodic tasks run by the scheduler
+        self._scheduled_tasks = {
+            'grid_monitoring': self._grid_monitoring_tick,
+            'demand_response_coordination': self._demand_response_coordination_tick,
+            'emergency_monitoring': self._emergency_monitoring_tick,
+            'grid_optimization': self._grid_optimization_tick,
+            'performance_reporting': self._performance_reporting_tick
+        }
+        
+        # Heap of (due time on the loop clock, sequence, task name)
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._schedule_seq = itertools.count()  # Keeps tasks due together in start-up order
+        self._scheduler_task: Optional[asyncio.Task] = None
+        
+        # Outbound signals queued as (recipient_id, message_type, payload, priority); None stops the outbox task
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._outbox_task: Optional[asyncio.Task] = None
+        
+        # Status payload skeleton, filled in place by get_status
+        self._status_template: Dict[str, Dict[str, Any]] = {
+            'grid_status': {
+                'frequency_hz': 0.0,
+                'voltage_v': 0.0,
+                'stability_score': 0.0,
+                'load_mw': 0.0,
+                'supply_mw': 0.0,
+                'uptime_percentage': 0.0
+            },
+            'demand_response_status': {
+                'active': False,
+                'target_reduction_mw': 0.0,
+                'duration_minutes': 0,
+                'participants_count': 0,
+                'savings': 0.0
+            },
+            'emergency_status': {
+                'active': False,
+                'type': None,
+                'start_time': None,
+                'response_count': 0
+            },
+            'optimization_status': self.optimization_status,
+            'grid_health': {
+                'stability_threshold': 0.0,
+                'demand_response_threshold': 0.0,
+                'monitoring_interval': 0
+            }
+        }
+        
+        self.logger.info("Grid Optimization Agent initialized")
 
-    async def _start_agent_specific(self):
-        """Start grid optimization-specific tasks."""
-        # Start grid monitoring
-        asyncio.create_task(self._grid_monitoring_loop())
+    def _update_thresholds(self):
+        """Precompute monitoring thresholds from config."""
+        config = self.grid_config
         
-        # Start demand response coordination
-        asyncio.create_task(self._demand_response_coordination_loop())
+        # Deviation limits in Hz and V, and their reciprocals for the stability kernel
+        self._frequency_issue_hz: float = config.frequency_deviation_threshold * 60.0
+        self._voltage_issue_v: float = config.voltage_deviation_threshold * 120.0
+        self._inv_frequency_threshold: float = 1.0 / self._frequency_issue_hz
+        self._inv_voltage_threshold: float = 1.0 / self._voltage_issue_v
         
-        # Start emergency monitoring
-        asyncio.create_task(self._emergency_monitoring_loop())
+        self._stability_threshold: float = config.grid_stability_threshold
+        self._demand_response_threshold: float = config.demand_response_threshold
+        self._max_demand_response_mw: float = config.max_demand_response_mw
         
-        # Start grid optimization
-        asyncio.create_task(self._grid_optimization_loop())
+        # Monitoring cadence (one cycle covers a batch of ticks) and the moving-average weight of one tick
+        self._task_intervals['grid_monitoring'] = float(
+            config.monitoring_interval_seconds * config.monitoring_batch_ticks
+        )
+        self._ema_alpha: float = 1.0 - math.exp(-config.monitoring_interval_seconds / HISTORY_EMA_SECONDS)
+
+    def update_config(self, updates: Dict[str, Any]):
+        """Update agent configuration and refresh derived thresholds."""
+        super().update_config(updates)
+        self._update_thresholds()
+
+    async def _start_agent_specific(self):
+        """Start grid optimization-specific tasks."""
+        # Warm up the stability kernel so monitoring never pays compile latency
+        stability_scores(np.full(1, 60.0), np.full(1, 120.0), np.ones(1), np.ones(1),
+                         self._inv_frequency_threshold, self._inv_voltage_threshold)
         
-        # Start performance reporting
-        asyncio.create_task(self._performance_reporting_loop())
+        # Run grid monitoring, demand response coordination, emergency monitoring,
+        # grid optimization and performance reporting from a single scheduler task
+        now = asyncio.get_running_loop().time()
+        self._schedule.clear()
+        for task_name in self._task_intervals:
+            heapq.heappush(self._schedule, (now, next(self._schedule_seq), task_name))
+        self._scheduler_task = asyncio.create_task(self._run_scheduler())
+        self._outbox_task = asyncio.create_task(self._run_outbox())
         
         self.logger.info("Grid Optimization Agent started")
 
     async def _stop_agent_specific(self):
         """Stop grid optimization-specific tasks."""
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            try:
+                await self._scheduler_task
+            except asyncio.CancelledError:
+                pass
+            self._scheduler_task = None
+        
+        # Let the outbox task send everything queued before stopping
+        if self._outbox_task is not None:
+            self._outbox.put_nowait(None)
+            await self._outbox_task
+            self._outbox_task = None
+        
         self.logger.info("Grid Optimization Agent stopped")
 
-    async def _grid_monitoring_loop(self):
-        """Main grid monitoring loop."""
-        while self.is_running:
+    async def _run_scheduler(self):
+        """Run periodic tasks as they fall due, sleeping until the next one."""
+        loop = asyncio.get_running_loop()
+        schedule = self._schedule
+        
+        while self.is_running and schedule:
+            due_time, _, task_name = schedule[0]
+            delay = due_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            
+            heapq.heappop(schedule)
             try:
-                # Collect grid metrics
-                await self._collect_grid_metrics()
-                
-                # Calculate grid stability
-                await self._calculate_grid_stability()
-                
-                # Check for grid issues
-                await self._check_grid_issues()
-                
-                # Store grid data
-                await self._store_grid_data()
-                
-                # Wait before next monitoring cycle
-                await asyncio.sleep(self.grid_config.monitoring_interval_seconds)
-                
+                await self._scheduled_tasks[task_name]()
+                # Keep a fixed cadence, but never schedule into the past after a slow run
+                next_due = max(due_time + self._task_intervals[task_name], loop.time())
             except Exception as e:
-                self.logger.error("Error in grid monitoring loop", error=str(e))
-                await asyncio.sleep(60)
+                self.logger.error("Error in scheduled task", task=task_name, error=str(e))
+                next_due = loop.time() + 60.0  # Wait before retrying
+            
+            heapq.heappush(schedule, (next_due, next(self._schedule_seq), task_name))
 
-    async def _demand_response_coordination_loop(self):
-        """Coordinate demand response programs."""
-        while self.is_running:
+    def _queue_message(self, recipient_id: str, message_type: str, payload: Dict[str, Any], priority: int = 0):
+        """Queue a message for the outbox task instead of waiting on the transport."""
+        self._outbox.put_nowait((recipient_id, message_type, payload, priority))
+
+    async def _run_outbox(self):
+        """Send queued messages in batches until a None entry is dequeued."""
+        while True:
+            entry = await self._outbox.get()
+            if entry is None:
+                return
+            
+            # Take whatever else has been queued since, up to the batch size
+            batch = [entry]
+            stopping = False
+            while len(batch) < OUTBOX_BATCH_SIZE and not self._outbox.empty():
+                entry = self._outbox.get_nowait()
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            # Send to the recipients concurrently, keeping each recipient's messages in queued order
+            batch.sort(key=lambda queued: queued[0])
+            await asyncio.gather(*(
+                self._send_queued(list(messages))
+                for _, messages in itertools.groupby(batch, key=lambda queued: queued[0])
+            ), return_exceptions=True)
+            
+            if stopping:
+                return
+
+    async def _send_queued(self, messages: List[Tuple[str, str, Dict[str, Any], int]]):
+        """Send queued messages one after another, logging failures without stopping."""
+        for recipient_id, message_type, payload, priority in messages:
             try:
-                # Check if demand response is needed
-                if self._should_activate_demand_response():
-                    await self._activate_demand_response()
-                
-                # Update demand response status
-                await self._update_demand_response_status()
-                
-                # Coordinate with participants
-                await self._coordinate_demand_response()
-                
-                # Wait before next coordination cycle
-                await asyncio.sleep(60)  # 1 minute intervals
-                
+                await self.send_message(
+                    recipient_id=recipient_id,
+                    message_type=message_type,
+                    payload=payload,
+                    priority=priority
+                )
             except Exception as e:
-                self.logger.error("Error in demand response coordination", error=str(e))
-                await asyncio.sleep(60)
+                self.logger.error("Error sending queued message", 
+                                recipient_id=recipient_id,
+                                message_type=message_type,
+                                error=str(e))
+
+    async def _grid_monitoring_tick(self):
+        """Run one grid monitoring cycle."""
+        # Collect grid metrics
+        collected = await self._collect_grid_metrics()
+        
+        # Calculate grid stability
+        await self._calculate_grid_stability()
+        
+        # Store history for every freshly collected tick
+        if collected:
+            frequency, voltage, load, _ = self._metric_batch
+            self._record_history(np.column_stack((frequency, voltage, load, self._stability_batch)))
+        
+        # Check for grid issues
+        await self._check_grid_issues()
+        
+        # Store grid data
+        await self._store_grid_data()
+
+    async def _demand_response_coordination_tick(self):
+        """Coordinate demand response programs."""
+        # Check if demand response is needed
+        if self._should_activate_demand_response():
+            await self._activate_demand_response()
+        
+        # Update demand response status
+        await self._update_demand_response_status()
+        
+        # Coordinate with participants
+        await self._coordinate_demand_response()
 
-    async def _emergency_monitoring_loop(self):
+    async def _emergency_monitoring_tick(self):
         """Monitor for grid emergencies."""
-        while self.is_running:
-            try:
-                # Check for emergency conditions
-                if self._detect_emergency_conditions():
-                    await self._activate_emergency_mode()
-                
-                # Update emergency status
-                await self._update_emergency_status()
-                
-                # Wait before next check
-                await asyncio.sleep(10)  # 10 second intervals for emergencies
-                
-            except Exception as e:
-                self.logger.error("Error in emergency monitoring", error=str(e))
-                await asyncio.sleep(60)
+        # Check for emergency conditions
+        if self._detect_emergency_conditions():
+            await self._activate_emergency_mode()
+        
+        # Update emergency status
+        await self._update_emergency_status()
 
-    async def _grid_optimization_loop(self):
+    async def _grid_optimization_tick(self):
         """Optimize grid operations."""
-        while self.is_running:
-            try:
-                # Run frequency regulation
-                await self._optimize_frequency_regulation()
-                
-                # Run voltage control
-                await self._optimize_voltage_control()
-                
-                # Run load balancing
-                await self._optimize_load_balancing()
-                
-                # Wait before next optimization cycle
-                await asyncio.sleep(300)  # 5 minutes
-                
-            except Exception as e:
-                self.logger.error("Error in grid optimization", error=str(e))
-                await asyncio.sleep(60)
+        # Snapshot the grid deviations once for every optimization pass
+        await self._optimize_all((
+            self.grid_frequency - 60.0,
+            self.grid_voltage - 120.0,
+            self._sd_ratio - 1.0
+        ))
 
-    async def _performance_reporting_loop(self):
+    async def _optimize_all(self, snapshot: Tuple[float, float, float]):
+        """Run every optimization pass against a (frequency deviation, voltage deviation, imbalance) snapshot."""
+        frequency_deviation, voltage_deviation, imbalance = snapshot
+        
+        # Run frequency regulation
+        await self._optimize_frequency_regulation(frequency_deviation)
+        
+        # Run voltage control
+        await self._optimize_voltage_control(voltage_deviation)
+        
+        # Run load balancing
+        await self._optimize_load_balancing(imbalance)
+
+    async def _performance_reporting_tick(self):
         """Generate and broadcast performance reports."""
-        while self.is_running:
-            try:
-                # Generate performance report
-                report = await self._generate_performance_report()
-                
-                # Broadcast to all agents
-                await self._broadcast_performance_report(report)
-                
-                # Wait before next report
-                await asyncio.sleep(600)  # 10 minutes
-                
-            except Exception as e:
-                self.logger.error("Error in performance reporting", error=str(e))
-                await asyncio.sleep(60)
+        # Skip the report while the grid state is unchanged, re-sending it at least once per keepalive interval
+        report_key = (
+            round(self.grid_frequency, 3),
+            round(self.grid_voltage, 2),
+            round(self.grid_stability_score, 3),
+            round(self.grid_load, 2),
+            round(self.grid_supply, 2),
+            self.demand_response_active,
+            self.demand_response_target,
+            self.emergency_mode,
+            self.emergency_type,
+            self.emergency_response_count
+        )
+        now = time.monotonic()
+        if report_key == self._last_report_key and now - self._last_report_at < PERFORMANCE_REPORT_KEEPALIVE_SECONDS:
+            return
+        self._last_report_key = report_key
+        self._last_report_at = now
+        
+        # Generate performance report
+        report = await self._generate_performance_report()
+        
+        # Broadcast to all agents
+        await self._broadcast_performance_report(report)
 
-    async def _collect_grid_metrics(self):
-        """Collect current grid metrics using MCP tools."""
+    async def _collect_grid_metrics(self) -> bool:
+        """Collect current grid metrics using MCP tools; returns whether a new batch was collected."""
         try:
             # In a real implementation, this would call grid monitoring APIs
             # For now, we'll simulate grid metrics
             
-            # Simulate frequency variations
-            frequency_variation = np.random.normal(0, 0.1)  # ±0.1 Hz variation
-            self.grid_frequency = 60.0 + frequency_variation
+            # Draw the variations for every tick in the batch in one call
+            ticks = self.grid_config.monitoring_batch_ticks
+            variations = self._rng.standard_normal((ticks, 4)) * SIMULATION_SIGMA
             
-            # Simulate voltage variations
-            voltage_variation = np.random.normal(0, 2.0)  # ±2V variation
-            self.grid_voltage = 120.0 + voltage_variation
+            # Simulate frequency and voltage variations
+            frequency = 60.0 + variations[:, 0]
+            voltage = 120.0 + variations[:, 1]
             
             # Simulate load and supply
             base_load = 1000.0  # MW
-            load_variation = np.random.normal(0, 50.0)  # ±50 MW variation
-            self.grid_load = max(0, base_load + load_variation)
+            load = np.maximum(0.0, base_load + variations[:, 2])
             
             # Supply follows load with some variation
-            supply_variation = np.random.normal(0, 30.0)  # ±30 MW variation
-            self.grid_supply = self.grid_load + supply_variation
+            supply = load + variations[:, 3]
             
-            # Store historical data
-            current_time = datetime.now(timezone.utc)
-            self.frequency_history.append((current_time, self.grid_frequency))
-            self.voltage_history.append((current_time, self.grid_voltage))
-            self.load_history.append((current_time, self.grid_load))
-            
-            # Keep only recent history (last 24 hours)
-            cutoff_time = current_time - timedelta(hours=24)
-            self.frequency_history = [(t, v) for t, v in self.frequency_history if t > cutoff_time]
-            self.voltage_history = [(t, v) for t, v in self.voltage_history if t > cutoff_time]
-            self.load_history = [(t, v) for t, v in self.load_history if t > cutoff_time]
+            # The latest tick is the current grid state
+            self._metric_batch = (frequency, voltage, load, supply)
+            self.grid_frequency = float(frequency[-1])
+            self.grid_voltage = float(voltage[-1])
+            self.grid_load = float(load[-1])
+            self.grid_supply = float(supply[-1])
+            self._sd_ratio = self.grid_supply / self.grid_load if self.grid_load > 0 else math.inf
+            return True
             
         except Exception as e:
             self.logger.error("Error collecting grid metrics", error=str(e))
+            return False
+
+    def _record_history(self, samples: np.ndarray):
+        """Fold a batch of samples (ticks x HISTORY_SERIES, oldest first) into the moving averages and buckets."""
+        for sample in samples:
+            if self._history_samples == 0:
+                self._history_ema[:] = sample  # Seed the averages with the first reading
+            else:
+                self._history_ema += self._ema_alpha * (sample - self._history_ema)
+            self._history_samples += 1
+        
+        # Close the current bucket when the minute rolls over, blanking any skipped minutes
+        minute = int(time.monotonic() // HISTORY_BUCKET_SECONDS)
+        if minute != self._bucket_minute:
+            size = len(self._history_buckets)
+            if self._bucket_count:
+                self._history_buckets[self._bucket_minute % size] = self._bucket_sum / self._bucket_count
+            skipped = np.arange(self._bucket_minute + 1, min(minute, self._bucket_minute + size + 1))
+            self._history_buckets[skipped % size] = np.nan
+            self._bucket_sum[:] = 0.0
+            self._bucket_count = 0
+            self._bucket_minute = minute
+        self._bucket_sum += samples.sum(axis=0)
+        self._bucket_count += len(samples)
 
     async def _calculate_grid_stability(self):
         """Calculate overall grid stability score."""
         try:
-            # Calculate frequency stability (0-1 scale)
-            frequency_deviation = abs(self.grid_frequency - 60.0) / 60.0
-            frequency_stability = max(0, 1.0 - frequency_deviation / self.grid_config.frequency_deviation_threshold)
-            
-            # Calculate voltage stability (0-1 scale)
-            voltage_deviation = abs(self.grid_voltage - 120.0) / 120.0
-            voltage_stability = max(0, 1.0 - voltage_deviation / self.grid_config.voltage_deviation_threshold)
-            
-            # Calculate supply-demand stability (0-1 scale)
-            if self.grid_load > 0:
-                supply_demand_ratio = self.grid_supply / self.grid_load
-                supply_demand_stability = min(1.0, supply_demand_ratio)
-            else:
-                supply_demand_stability = 1.0
-            
-            # Calculate overall stability score (weighted average)
-            self.grid_stability_score = (
-                frequency_stability * 0.4 +
-                voltage_stability * 0.3 +
-                supply_demand_stability * 0.3
+            # Frequency, voltage, supply-demand and overall stability (0-1 scale) per tick
+            scores = stability_scores(
+                *self._metric_batch, self._inv_frequency_threshold, self._inv_voltage_threshold
             )
+            stability = scores[:, STABILITY_OVERALL]
+            self.grid_stability_score = float(stability[-1])
+            
+            # Classify emergency conditions for every tick in one pass
+            frequency, voltage, load, supply = self._metric_batch
+            emergency_mask = (
+                (np.abs(frequency - 60.0) > 0.5) * EMERGENCY_FREQUENCY
+                | (np.abs(voltage - 120.0) > 10.0) * EMERGENCY_VOLTAGE
+                | ((load > 0) & (supply < 0.7 * load)) * EMERGENCY_SUPPLY_DEMAND
+                | (stability < 0.8) * EMERGENCY_STABILITY
+            )
+            self._emergency_mask = int(emergency_mask[-1])
             
-            # Store stability history
-            current_time = datetime.now(timezone.utc)
-            self.stability_history.append((current_time, self.grid_stability_score))
-            
-            # Keep only recent history
-            cutoff_time = current_time - timedelta(hours=24)
-            self.stability_history = [(t, v) for t, v in self.stability_history if t > cutoff_time]
+            self._stability_batch = stability
             
-            self.logger.debug("Grid stability calculated", 
-                            stability_score=self.grid_stability_score,
-                            frequency_stability=frequency_stability,
-                            voltage_stability=voltage_stability,
-                            supply_demand_stability=supply_demand_stability)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Grid stability calculated", 
+                                stability_score=self.grid_stability_score,
+                                frequency_stability=float(scores[-1, STABILITY_FREQUENCY]),
+                                voltage_stability=float(scores[-1, STABILITY_VOLTAGE]),
+                                supply_demand_stability=float(scores[-1, STABILITY_SUPPLY_DEMAND]))
             
         except Exception as e:
             self.logger.error("Error calculating grid stability", error=str(e))
@@ -281,53 +609,57 @@ class GridOptimizationAgent(BaseAgent):
     async def _check_grid_issues(self):
         """Check for grid issues and take corrective action."""
         try:
+            # Classify frequency, voltage and supply-demand issues once
+            frequency_deviation = abs(self.grid_frequency - 60.0)
+            voltage_deviation = abs(self.grid_voltage - 120.0)
+            issue_mask = (
+                (frequency_deviation > self._frequency_issue_hz) * ISSUE_FREQUENCY
+                | (voltage_deviation > self._voltage_issue_v) * ISSUE_VOLTAGE
+                | (self._sd_ratio < self._demand_response_threshold) * ISSUE_SUPPLY_DEMAND
+            )
+            
             # Check stability threshold
-            if self.grid_stability_score < self.grid_config.grid_stability_threshold:
-                self.logger.warning("Grid stability below threshold", 
-                                  stability_score=self.grid_stability_score,
-                                  threshold=self.grid_config.grid_stability_threshold)
+            if self.grid_stability_score < self._stability_threshold:
+                if self.logger.isEnabledFor(logging.WARNING):
+                    self.logger.warning("Grid stability below threshold", 
+                                      stability_score=self.grid_stability_score,
+                                      threshold=self._stability_threshold)
                 
                 # Take corrective action
-                await self._take_corrective_action()
+                await self._take_corrective_action(issue_mask)
             
             # Check frequency deviation
-            if abs(self.grid_frequency - 60.0) > self.grid_config.frequency_deviation_threshold * 60.0:
-                self.logger.warning("Grid frequency deviation detected", 
-                                  frequency=self.grid_frequency,
-                                  deviation=abs(self.grid_frequency - 60.0))
+            if issue_mask & ISSUE_FREQUENCY:
+                if self.logger.isEnabledFor(logging.WARNING):
+                    self.logger.warning("Grid frequency deviation detected", 
+                                      frequency=self.grid_frequency,
+                                      deviation=frequency_deviation)
             
             # Check voltage deviation
-            if abs(self.grid_voltage - 120.0) > self.grid_config.voltage_deviation_threshold * 120.0:
-                self.logger.warning("Grid voltage deviation detected", 
-                                  voltage=self.grid_voltage,
-                                  deviation=abs(self.grid_voltage - 120.0))
+            if issue_mask & ISSUE_VOLTAGE:
+                if self.logger.isEnabledFor(logging.WARNING):
+                    self.logger.warning("Grid voltage deviation detected", 
+                                      voltage=self.grid_voltage,
+                                      deviation=voltage_deviation)
             
             # Check supply-demand balance
-            if self.grid_load > 0 and self.grid_supply / self.grid_load < self.grid_config.demand_response_threshold:
-                self.logger.warning("Supply-demand imbalance detected", 
-                                  ratio=self.grid_supply / self.grid_load,
-                                  threshold=self.grid_config.demand_response_threshold)
+            if issue_mask & ISSUE_SUPPLY_DEMAND:
+                if self.logger.isEnabledFor(logging.WARNING):
+                    self.logger.warning("Supply-demand imbalance detected", 
+                                      ratio=self._sd_ratio,
+                                      threshold=self._demand_response_threshold)
                 
         except Exception as e:
             self.logger.error("Error checking grid issues", error=str(e))
 
-    async def _take_corrective_action(self):
-        """Take corrective action for grid issues."""
+    async def _take_corrective_action(self, issue_mask: int):
+        """Take corrective action for the highest-priority grid issue in the ISSUE_* mask."""
         try:
-            # Determine the type of issue
-            if abs(self.grid_frequency - 60.0) > self.grid_config.frequency_deviation_threshold * 60.0:
-                # Frequency issue - activate frequency regulation
-                await self._activate_frequency_regulation()
-            
-            elif abs(self.grid_voltage - 120.0) > self.grid_config.voltage_deviation_threshold * 120.0:
-                # Voltage issue - activate voltage control
-                await self._activate_voltage_control()
-            
-            elif self.grid_load > 0 and self.grid_supply / self.grid_load < self.grid_config.demand_response_threshold:
-                # Supply-demand issue - activate demand response
-                await self._activate_demand_response()
+            if issue_mask:
+                await self._corrective_actions[(issue_mask & -issue_mask).bit_length() - 1]()
             
-            self.logger.info("Corrective action taken for grid stability issue")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Corrective action taken for grid stability issue")
             
         except Exception as e:
             self.logger.error("Error taking corrective action", error=str(e))
@@ -340,13 +672,11 @@ class GridOptimizationAgent(BaseAgent):
                 return False
             
             # Check supply-demand ratio
-            if self.grid_load > 0:
-                supply_demand_ratio = self.grid_supply / self.grid_load
-                if supply_demand_ratio < self.grid_config.demand_response_threshold:
-                    return True
+            if self._sd_ratio < self._demand_response_threshold:
+                return True
             
             # Check grid stability
-            if self.grid_stability_score < self.grid_config.grid_stability_threshold:
+            if self.grid_stability_score < self._stability_threshold:
                 return True
             
             return False
@@ -360,15 +690,15 @@ class GridOptimizationAgent(BaseAgent):
         try:
             # Calculate target reduction
             if self.grid_load > 0:
-                current_ratio = self.grid_supply / self.grid_load
-                target_ratio = self.grid_config.demand_response_threshold + 0.1  # Add 10% buffer
+                current_ratio = self._sd_ratio
+                target_ratio = self._demand_response_threshold + 0.1  # Add 10% buffer
                 reduction_needed = self.grid_load * (1 - current_ratio / target_ratio)
-                self.demand_response_target = min(reduction_needed, self.grid_config.max_demand_response_mw)
+                self.demand_response_target = min(reduction_needed, self._max_demand_response_mw)
             else:
-                self.demand_response_target = self.grid_config.max_demand_response_mw
+                self.demand_response_target = self._max_demand_response_mw
             
             # Set duration (30 minutes)
-            self.demand_response_duration = timedelta(minutes=30)
+            self._dr_remaining_s = DEMAND_RESPONSE_DURATION_SECONDS
             
             # Activate demand response
             self.demand_response_active = True
@@ -378,7 +708,7 @@ class GridOptimizationAgent(BaseAgent):
             
             self.logger.info("Demand response activated", 
                            target_reduction=self.demand_response_target,
-                           duration=self.demand_response_duration)
+                           duration=timedelta(seconds=self._dr_remaining_s))
             
         except Exception as e:
             self.logger.error("Error activating demand response", error=str(e))
@@ -388,19 +718,22 @@ class GridOptimizationAgent(BaseAgent):
         try:
             if self.demand_response_active:
                 # Check if demand response period has ended
-                if self.demand_response_duration <= timedelta(0):
+                if self._dr_remaining_s <= 0:
                     # End demand response
                     self.demand_response_active = False
                     self.demand_response_target = 0.0
-                    self.demand_response_duration = timedelta(minutes=0)
+                    self._dr_remaining_s = 0
+                    self._dr_signal_key = None
                     
                     # Notify agents that demand response has ended
                     await self._broadcast_demand_response_end()
                     
                     self.logger.info("Demand response ended")
                 else:
-                    # Reduce remaining duration
-                    self.demand_response_duration -= timedelta(minutes=1)
+                    # Reduce remaining duration by one coordination interval
+                    self._dr_remaining_s = max(
+                        0, self._dr_remaining_s - int(self._task_intervals['demand_response_coordination'])
+                    )
             
         except Exception as e:
             self.logger.error("Error updating demand response status", error=str(e))
@@ -412,58 +745,45 @@ class GridOptimizationAgent(BaseAgent):
                 return
             
             # Get list of participating agents
-            participants = ['consumer_agent']  # In a real system, this would be dynamic
+            participants = ('consumer_agent',)  # In a real system, this would be dynamic
+            
+            # Participants schedule the end of the event from the first signal, so only
+            # signal again when the target or the participants change
+            signal_key = (self.demand_response_target, participants)
+            if signal_key == self._dr_signal_key:
+                return
+            self._dr_signal_key = signal_key
             
             # Calculate reduction per participant
             reduction_per_participant = self.demand_response_target / max(len(participants), 1)
             
             # Send demand response signals
+            duration_minutes = self._dr_remaining_s // 60
             for participant_id in participants:
-                signal = {
-                    'target_reduction_mw': reduction_per_participant,
-                    'duration_minutes': int(self.demand_response_duration.total_seconds() / 60),
-                    'incentive_rate': 0.15,  # 15% incentive
-                    'priority': 'high'
-                }
+                signal = DEMAND_RESPONSE_SIGNAL.copy()
+                signal['target_reduction_mw'] = reduction_per_participant
+                signal['duration_minutes'] = duration_minutes
                 
-                await self.send_message(
+                self._queue_message(
                     recipient_id=participant_id,
                     message_type='demand_response_signal',
                     payload=signal,
                     priority=7
                 )
             
-            self.logger.debug("Demand response coordinated", 
-                            participants=len(participants),
-                            reduction_per_participant=reduction_per_participant)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Demand response coordinated", 
+                                participants=len(participants),
+                                reduction_per_participant=reduction_per_participant)
             
         except Exception as e:
             self.logger.error("Error coordinating demand response", error=str(e))
 
     def _detect_emergency_conditions(self) -> bool:
         """Detect if emergency conditions exist."""
-        try:
-            # Check for critical frequency deviation
-            if abs(self.grid_frequency - 60.0) > 0.5:  # ±0.5 Hz
-                return True
-            
-            # Check for critical voltage deviation
-            if abs(self.grid_voltage - 120.0) > 10.0:  # ±10V
-                return True
-            
-            # Check for critical supply-demand imbalance
-            if self.grid_load > 0 and self.grid_supply / self.grid_load < 0.7:
-                return True
-            
-            # Check for critical stability score
-            if self.grid_stability_score < 0.8:
-                return True
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error("Error detecting emergency conditions", error=str(e))
-            return False
+        # Critical frequency, voltage, supply-demand or stability conditions,
+        # classified when the stability score was calculated
+        return self._emergency_mask != 0
 
     async def _activate_emergency_mode(self):
         """Activate emergency mode for grid protection."""
@@ -471,13 +791,10 @@ class GridOptimizationAgent(BaseAgent):
             if self.emergency_mode:
                 return  # Already in emergency mode
             
-            # Determine emergency type
-            if abs(self.grid_frequency - 60.0) > 0.5:
-                emergency_type = "frequency_emergency"
-            elif abs(self.grid_voltage - 120.0) > 10.0:
-                emergency_type = "voltage_emergency"
-            elif self.grid_load > 0 and self.grid_supply / self.grid_load < 0.7:
-                emergency_type = "supply_demand_emergency"
+            # Determine emergency type from the highest-priority condition
+            mask = self._emergency_mask
+            if mask:
+                emergency_type = EMERGENCY_TYPES[(mask & -mask).bit_length() - 1]
             else:
                 emergency_type = "stability_emergency"
             
@@ -485,6 +802,7 @@ class GridOptimizationAgent(BaseAgent):
             self.emergency_mode = True
             self.emergency_type = emergency_type
             self.emergency_start_time = datetime.now(timezone.utc)
+            self._emergency_start_iso = self.emergency_start_time.isoformat()
             self.emergency_response_count += 1
             
             # Take emergency actions
@@ -493,6 +811,9 @@ class GridOptimizationAgent(BaseAgent):
             # Notify all agents
             await self._broadcast_emergency_signal(emergency_type)
             
+            # Send the collected emergency signals, one message per recipient
+            self._flush_emergency_batch()
+            
             self.logger.warning("Emergency mode activated", 
                               emergency_type=emergency_type,
                               response_count=self.emergency_response_count)
@@ -500,26 +821,38 @@ class GridOptimizationAgent(BaseAgent):
         except Exception as e:
             self.logger.error("Error activating emergency mode", error=str(e))
 
+    def _queue_emergency_signal(self, recipient_id: str, message_type: str, payload: Dict[str, Any],
+                                priority: int = 0):
+        """Collect an emergency signal until the emergency batch is flushed."""
+        self._pending_emergency_signals[recipient_id].append((message_type, payload, priority))
+
+    def _flush_emergency_batch(self):
+        """Queue the collected emergency signals, fusing a recipient's signals into one emergency_batch message."""
+        pending, self._pending_emergency_signals = self._pending_emergency_signals, defaultdict(list)
+        for recipient_id, signals in pending.items():
+            if len(signals) == 1:
+                # A lone signal keeps its own message type
+                message_type, payload, priority = signals[0]
+            else:
+                message_type = 'emergency_batch'
+                payload = {
+                    'signals': [
+                        {'message_type': signal_type, 'payload': signal_payload}
+                        for signal_type, signal_payload, _ in signals
+                    ]
+                }
+                priority = max(signal_priority for _, _, signal_priority in signals)
+            self._queue_message(recipient_id, message_type, payload, priority)
+
     async def _take_emergency_actions(self, emergency_type: str):
         """Take emergency actions based on emergency type."""
         try:
-            if emergency_type == "frequency_emergency":
-                # Activate all frequency regulation resources
-                await self._activate_emergency_frequency_regulation()
-                
-            elif emergency_type == "voltage_emergency":
-                # Activate all voltage control resources
-                await self._activate_emergency_voltage_control()
-                
-            elif emergency_type == "supply_demand_emergency":
-                # Activate maximum demand response
-                await self._activate_emergency_demand_response()
-                
-            elif emergency_type == "stability_emergency":
-                # Activate all optimization algorithms
-                await self._activate_emergency_optimization()
+            action = self._emergency_actions.get(emergency_type)
+            if action is not None:
+                await action()
             
-            self.logger.info("Emergency actions taken", emergency_type=emergency_type)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Emergency actions taken", emergency_type=emergency_type)
             
         except Exception as e:
             self.logger.error("Error taking emergency actions", error=str(e))
@@ -535,43 +868,44 @@ class GridOptimizationAgent(BaseAgent):
                 # Exit emergency mode
                 self.emergency_mode = False
                 self.emergency_type = None
-                self.emergency_start_time = None
                 
-                # Notify agents that emergency has ended
+                # Notify agents that emergency has ended (the end signal reports the duration from the start time)
                 await self._broadcast_emergency_end()
+                self.emergency_start_time = None
+                self._emergency_start_iso = None
                 
                 self.logger.info("Emergency mode ended")
             
         except Exception as e:
             self.logger.error("Error updating emergency status", error=str(e))
 
-    async def _optimize_frequency_regulation(self):
-        """Optimize grid frequency regulation."""
+    async def _optimize_frequency_regulation(self, deviation: Optional[float] = None):
+        """Optimize grid frequency regulation, optionally from an already computed frequency deviation."""
         try:
+            if deviation is None:
+                deviation = self.grid_frequency - 60.0
+            
             # Check if frequency regulation is needed
-            if abs(self.grid_frequency - 60.0) > 0.05:  # ±0.05 Hz threshold
+            if abs(deviation) > 0.05:  # ±0.05 Hz threshold
                 # Activate frequency regulation
                 self.optimization_status['frequency_regulation'] = True
                 
                 # Send frequency regulation signal to producers
-                regulation_signal = {
-                    'regulation_type': 'frequency',
-                    'target_frequency': 60.0,
-                    'current_frequency': self.grid_frequency,
-                    'deviation': self.grid_frequency - 60.0,
-                    'priority': 'medium'
-                }
+                regulation_signal = FREQUENCY_REGULATION_SIGNAL.copy()
+                regulation_signal['current_frequency'] = self.grid_frequency
+                regulation_signal['deviation'] = deviation
                 
-                await self.send_message(
+                self._queue_message(
                     recipient_id='producer_agent',
                     message_type='frequency_regulation_signal',
                     payload=regulation_signal,
                     priority=6
                 )
                 
-                self.logger.info("Frequency regulation activated", 
-                               current_frequency=self.grid_frequency,
-                               deviation=regulation_signal['deviation'])
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Frequency regulation activated", 
+                                   current_frequency=self.grid_frequency,
+                                   deviation=regulation_signal['deviation'])
             else:
                 # Deactivate frequency regulation
                 self.optimization_status['frequency_regulation'] = False
@@ -579,33 +913,33 @@ class GridOptimizationAgent(BaseAgent):
         except Exception as e:
             self.logger.error("Error optimizing frequency regulation", error=str(e))
 
-    async def _optimize_voltage_control(self):
-        """Optimize grid voltage control."""
+    async def _optimize_voltage_control(self, deviation: Optional[float] = None):
+        """Optimize grid voltage control, optionally from an already computed voltage deviation."""
         try:
+            if deviation is None:
+                deviation = self.grid_voltage - 120.0
+            
             # Check if voltage control is needed
-            if abs(self.grid_voltage - 120.0) > 2.0:  # ±2V threshold
+            if abs(deviation) > 2.0:  # ±2V threshold
                 # Activate voltage control
                 self.optimization_status['voltage_control'] = True
                 
                 # Send voltage control signal to producers
-                control_signal = {
-                    'control_type': 'voltage',
-                    'target_voltage': 120.0,
-                    'current_voltage': self.grid_voltage,
-                    'deviation': self.grid_voltage - 120.0,
-                    'priority': 'medium'
-                }
+                control_signal = VOLTAGE_CONTROL_SIGNAL.copy()
+                control_signal['current_voltage'] = self.grid_voltage
+                control_signal['deviation'] = deviation
                 
-                await self.send_message(
+                self._queue_message(
                     recipient_id='producer_agent',
                     message_type='voltage_control_signal',
                     payload=control_signal,
                     priority=6
                 )
                 
-                self.logger.info("Voltage control activated", 
-                               current_voltage=self.grid_voltage,
-                               deviation=control_signal['deviation'])
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Voltage control activated", 
+                                   current_voltage=self.grid_voltage,
+                                   deviation=control_signal['deviation'])
             else:
                 # Deactivate voltage control
                 self.optimization_status['voltage_control'] = False
@@ -613,34 +947,35 @@ class GridOptimizationAgent(BaseAgent):
         except Exception as e:
             self.logger.error("Error optimizing voltage control", error=str(e))
 
-    async def _optimize_load_balancing(self):
-        """Optimize grid load balancing."""
+    async def _optimize_load_balancing(self, imbalance: Optional[float] = None):
+        """Optimize grid load balancing, optionally from an already computed supply/load imbalance."""
         try:
-            # Check if load balancing is needed
-            if self.grid_load > 0 and abs(self.grid_supply - self.grid_load) / self.grid_load > 0.05:
+            if imbalance is None:
+                imbalance = self._sd_ratio - 1.0
+            
+            # Check if load balancing is needed (the imbalance is infinite without load)
+            if math.isfinite(imbalance) and abs(imbalance) > 0.05:
                 # Activate load balancing
                 self.optimization_status['load_balancing'] = True
                 
                 # Send load balancing signal to market supervisor
-                balancing_signal = {
-                    'balancing_type': 'load',
-                    'current_load': self.grid_load,
-                    'current_supply': self.grid_supply,
-                    'imbalance': (self.grid_supply - self.grid_load) / self.grid_load,
-                    'priority': 'medium'
-                }
+                balancing_signal = LOAD_BALANCING_SIGNAL.copy()
+                balancing_signal['current_load'] = self.grid_load
+                balancing_signal['current_supply'] = self.grid_supply
+                balancing_signal['imbalance'] = imbalance
                 
-                await self.send_message(
+                self._queue_message(
                     recipient_id='market_supervisor_agent',
                     message_type='load_balancing_signal',
                     payload=balancing_signal,
                     priority=6
                 )
                 
-                self.logger.info("Load balancing activated", 
-                               load=self.grid_load,
-                               supply=self.grid_supply,
-                               imbalance=balancing_signal['imbalance'])
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Load balancing activated", 
+                                   load=self.grid_load,
+                                   supply=self.grid_supply,
+                                   imbalance=balancing_signal['imbalance'])
             else:
                 # Deactivate load balancing
                 self.optimization_status['load_balancing'] = False
@@ -652,24 +987,21 @@ class GridOptimizationAgent(BaseAgent):
         """Activate emergency frequency regulation."""
         try:
             # Send emergency frequency regulation signal
-            emergency_signal = {
-                'regulation_type': 'emergency_frequency',
-                'target_frequency': 60.0,
-                'current_frequency': self.grid_frequency,
-                'deviation': self.grid_frequency - 60.0,
-                'priority': 'emergency',
-                'response_time': self.grid_config.emergency_response_time_seconds
-            }
+            emergency_signal = EMERGENCY_FREQUENCY_REGULATION_SIGNAL.copy()
+            emergency_signal['current_frequency'] = self.grid_frequency
+            emergency_signal['deviation'] = self.grid_frequency - 60.0
+            emergency_signal['response_time'] = self.grid_config.emergency_response_time_seconds
             
-            await self.send_message(
+            self._queue_emergency_signal(
                 recipient_id='producer_agent',
                 message_type='emergency_frequency_regulation',
                 payload=emergency_signal,
                 priority=9
             )
             
-            self.logger.warning("Emergency frequency regulation activated", 
-                              signal=emergency_signal)
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning("Emergency frequency regulation activated", 
+                                  signal=emergency_signal)
             
         except Exception as e:
             self.logger.error("Error activating emergency frequency regulation", error=str(e))
@@ -678,24 +1010,21 @@ class GridOptimizationAgent(BaseAgent):
         """Activate emergency voltage control."""
         try:
             # Send emergency voltage control signal
-            emergency_signal = {
-                'control_type': 'emergency_voltage',
-                'target_voltage': 120.0,
-                'current_voltage': self.grid_voltage,
-                'deviation': self.grid_voltage - 120.0,
-                'priority': 'emergency',
-                'response_time': self.grid_config.emergency_response_time_seconds
-            }
+            emergency_signal = EMERGENCY_VOLTAGE_CONTROL_SIGNAL.copy()
+            emergency_signal['current_voltage'] = self.grid_voltage
+            emergency_signal['deviation'] = self.grid_voltage - 120.0
+            emergency_signal['response_time'] = self.grid_config.emergency_response_time_seconds
             
-            await self.send_message(
+            self._queue_emergency_signal(
                 recipient_id='producer_agent',
                 message_type='emergency_voltage_control',
                 payload=emergency_signal,
                 priority=9
             )
             
-            self.logger.warning("Emergency voltage control activated", 
-                              signal=emergency_signal)
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning("Emergency voltage control activated", 
+                                  signal=emergency_signal)
             
         except Exception as e:
             self.logger.error("Error activating emergency voltage control", error=str(e))
@@ -706,27 +1035,24 @@ class GridOptimizationAgent(BaseAgent):
             # Calculate maximum demand response needed
             emergency_target = min(
                 self.grid_load * 0.3,  # Up to 30% of load
-                self.grid_config.max_demand_response_mw
+                self._max_demand_response_mw
             )
             
             # Send emergency demand response signal
-            emergency_signal = {
-                'target_reduction_mw': emergency_target,
-                'duration_minutes': 15,  # 15 minutes for emergency
-                'incentive_rate': 0.25,  # 25% incentive for emergency
-                'priority': 'emergency',
-                'response_time': self.grid_config.emergency_response_time_seconds
-            }
+            emergency_signal = EMERGENCY_DEMAND_RESPONSE_SIGNAL.copy()
+            emergency_signal['target_reduction_mw'] = emergency_target
+            emergency_signal['response_time'] = self.grid_config.emergency_response_time_seconds
             
-            await self.send_message(
+            self._queue_emergency_signal(
                 recipient_id='consumer_agent',
                 message_type='emergency_demand_response',
                 payload=emergency_signal,
                 priority=9
             )
             
-            self.logger.warning("Emergency demand response activated", 
-                              signal=emergency_signal)
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning("Emergency demand response activated", 
+                                  signal=emergency_signal)
             
         except Exception as e:
             self.logger.error("Error activating emergency demand response", error=str(e))
@@ -739,22 +1065,20 @@ class GridOptimizationAgent(BaseAgent):
                 self.optimization_status[algorithm] = True
             
             # Send emergency optimization signal
-            emergency_signal = {
-                'optimization_type': 'emergency_all',
-                'algorithms': self.optimization_algorithms,
-                'priority': 'emergency',
-                'response_time': self.grid_config.emergency_response_time_seconds
-            }
+            emergency_signal = EMERGENCY_OPTIMIZATION_SIGNAL.copy()
+            emergency_signal['algorithms'] = self.optimization_algorithms
+            emergency_signal['response_time'] = self.grid_config.emergency_response_time_seconds
             
-            await self.send_message(
+            self._queue_emergency_signal(
                 recipient_id='producer_agent',
                 message_type='emergency_optimization',
                 payload=emergency_signal,
                 priority=9
             )
             
-            self.logger.warning("Emergency optimization activated", 
-                              signal=emergency_signal)
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning("Emergency optimization activated", 
+                                  signal=emergency_signal)
             
         except Exception as e:
             self.logger.error("Error activating emergency optimization", error=str(e))
@@ -765,24 +1089,22 @@ class GridOptimizationAgent(BaseAgent):
             signal = {
                 'demand_response_active': True,
                 'target_reduction_mw': self.demand_response_target,
-                'duration_minutes': int(self.demand_response_duration.total_seconds() / 60),
+                'duration_minutes': self._dr_remaining_s // 60,
                 'incentive_rate': 0.15,
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
             
             # Send to relevant agents
-            agents_to_notify = ['consumer_agent', 'market_supervisor_agent']
-            
-            for agent_id in agents_to_notify:
-                await self.send_message(
-                    recipient_id=agent_id,
-                    message_type='demand_response_announcement',
-                    payload=signal,
-                    priority=6
-                )
+            await self.send_message_many(
+                DEMAND_RESPONSE_AGENTS,
+                message_type='demand_response_announcement',
+                payload=signal,
+                priority=6
+            )
             
-            self.logger.info("Demand response signal broadcasted", 
-                           recipient_count=len(agents_to_notify))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Demand response signal broadcasted", 
+                               recipient_count=len(DEMAND_RESPONSE_AGENTS))
             
         except Exception as e:
             self.logger.error("Error broadcasting demand response signal", error=str(e))
@@ -796,18 +1118,16 @@ class GridOptimizationAgent(BaseAgent):
             }
             
             # Send to relevant agents
-            agents_to_notify = ['consumer_agent', 'market_supervisor_agent']
-            
-            for agent_id in agents_to_notify:
-                await self.send_message(
-                    recipient_id=agent_id,
-                    message_type='demand_response_end',
-                    payload=signal,
-                    priority=5
-                )
+            await self.send_message_many(
+                DEMAND_RESPONSE_AGENTS,
+                message_type='demand_response_end',
+                payload=signal,
+                priority=5
+            )
             
-            self.logger.info("Demand response end signal broadcasted", 
-                           recipient_count=len(agents_to_notify))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Demand response end signal broadcasted", 
+                               recipient_count=len(DEMAND_RESPONSE_AGENTS))
             
         except Exception as e:
             self.logger.error("Error broadcasting demand response end signal", error=str(e))
@@ -822,29 +1142,23 @@ class GridOptimizationAgent(BaseAgent):
                     'frequency': self.grid_frequency,
                     'voltage': self.grid_voltage,
                     'stability_score': self.grid_stability_score,
-                    'supply_demand_ratio': self.grid_supply / self.grid_load if self.grid_load > 0 else 1.0
+                    'supply_demand_ratio': self._sd_ratio if self.grid_load > 0 else 1.0
                 }
             }
             
-            # Send to all agents
-            agents_to_notify = [
-                'forecasting_agent',
-                'producer_agent',
-                'consumer_agent',
-                'market_supervisor_agent'
-            ]
-            
-            for agent_id in agents_to_notify:
-                await self.send_message(
+            # Send to all agents, together with the emergency actions' signals
+            for agent_id in BROADCAST_AGENTS:
+                self._queue_emergency_signal(
                     recipient_id=agent_id,
                     message_type='grid_emergency',
                     payload=signal,
                     priority=9
                 )
             
-            self.logger.warning("Emergency signal broadcasted", 
-                              emergency_type=emergency_type,
-                              recipient_count=len(agents_to_notify))
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning("Emergency signal broadcasted", 
+                                  emergency_type=emergency_type,
+                                  recipient_count=len(BROADCAST_AGENTS))
             
         except Exception as e:
             self.logger.error("Error broadcasting emergency signal", error=str(e))
@@ -852,30 +1166,24 @@ class GridOptimizationAgent(BaseAgent):
     async def _broadcast_emergency_end(self):
         """Broadcast emergency end signal."""
         try:
+            now = datetime.now(timezone.utc)
             signal = {
                 'emergency_ended': True,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'duration_minutes': (datetime.now(timezone.utc) - self.emergency_start_time).total_seconds() / 60 if self.emergency_start_time else 0
+                'timestamp': now.isoformat(),
+                'duration_minutes': (now - self.emergency_start_time).total_seconds() / 60 if self.emergency_start_time else 0
             }
             
             # Send to all agents
-            agents_to_notify = [
-                'forecasting_agent',
-                'producer_agent',
-                'consumer_agent',
-                'market_supervisor_agent'
-            ]
-            
-            for agent_id in agents_to_notify:
-                await self.send_message(
-                    recipient_id=agent_id,
-                    message_type='grid_emergency_end',
-                    payload=signal,
-                    priority=7
-                )
+            await self.send_message_many(
+                BROADCAST_AGENTS,
+                message_type='grid_emergency_end',
+                payload=signal,
+                priority=7
+            )
             
-            self.logger.info("Emergency end signal broadcasted", 
-                           recipient_count=len(agents_to_notify))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Emergency end signal broadcasted", 
+                               recipient_count=len(BROADCAST_AGENTS))
             
         except Exception as e:
             self.logger.error("Error broadcasting emergency end signal", error=str(e))
@@ -897,16 +1205,17 @@ class GridOptimizationAgent(BaseAgent):
                     'emergency_response_count': self.emergency_response_count,
                     'demand_response_savings': self.demand_response_savings
                 },
+                'grid_trends': self._history_trends(),
                 'optimization_status': self.optimization_status,
                 'demand_response_status': {
                     'active': self.demand_response_active,
                     'target_reduction_mw': self.demand_response_target,
-                    'duration_minutes': int(self.demand_response_duration.total_seconds() / 60) if self.demand_response_duration else 0
+                    'duration_minutes': self._dr_remaining_s // 60
                 },
                 'emergency_status': {
                     'active': self.emergency_mode,
                     'type': self.emergency_type,
-                    'start_time': self.emergency_start_time.isoformat() if self.emergency_start_time else None
+                    'start_time': self._emergency_start_iso
                 }
             }
             
@@ -916,27 +1225,29 @@ class GridOptimizationAgent(BaseAgent):
             self.logger.error("Error generating performance report", error=str(e))
             return {}
 
+    def _history_trends(self) -> Dict[str, Optional[float]]:
+        """Summarize the grid metric history as moving averages and means over the kept buckets."""
+        trends: Dict[str, Optional[float]] = {}
+        buckets = self._history_buckets[~np.isnan(self._history_buckets[:, 0])]
+        for column, name in enumerate(HISTORY_SERIES):
+            trends[f'{name}_ema'] = float(self._history_ema[column]) if self._history_samples else None
+            trends[f'{name}_avg'] = float(buckets[:, column].mean()) if len(buckets) else None
+        return trends
+
     async def _broadcast_performance_report(self, report: Dict[str, Any]):
         """Broadcast performance report to all agents."""
         try:
             # Send to all known agents
-            agents_to_notify = [
-                'forecasting_agent',
-                'producer_agent',
-                'consumer_agent',
-                'market_supervisor_agent'
-            ]
-            
-            for agent_id in agents_to_notify:
-                await self.send_message(
-                    recipient_id=agent_id,
-                    message_type='grid_performance_report',
-                    payload=report,
-                    priority=3
-                )
+            await self.send_message_many(
+                BROADCAST_AGENTS,
+                message_type='grid_performance_report',
+                payload=report,
+                priority=3
+            )
             
-            self.logger.info("Performance report broadcasted", 
-                           recipient_count=len(agents_to_notify))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Performance report broadcasted", 
+                               recipient_count=len(BROADCAST_AGENTS))
             
         except Exception as e:
             self.logger.error("Error broadcasting performance report", error=str(e))
@@ -944,62 +1255,32 @@ class GridOptimizationAgent(BaseAgent):
     async def _store_grid_data(self):
         """Store grid data in Timestream."""
         try:
-            records = []
-            timestamp = datetime.now(timezone.utc)
-            
-            # Store grid metrics
-            records.extend([
-                {
-                    'measure_name': 'grid_frequency',
-                    'value': self.grid_frequency,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'grid_voltage',
-                    'value': self.grid_voltage,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'grid_stability_score',
-                    'value': self.grid_stability_score,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'grid_load',
-                    'value': self.grid_load,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'grid_supply',
-                    'value': self.grid_supply,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'demand_response_active',
-                    'value': 1.0 if self.demand_response_active else 0.0,
-                    'timestamp': timestamp
-                },
-                {
-                    'measure_name': 'emergency_mode',
-                    'value': 1.0 if self.emergency_mode else 0.0,
-                    'timestamp': timestamp
-                }
-            ])
+            # Store grid metrics as one multi-measure record
+            values = (
+                self.grid_frequency,
+                self.grid_voltage,
+                self.grid_stability_score,
+                self.grid_load,
+                self.grid_supply,
+                1.0 if self.demand_response_active else 0.0,
+                1.0 if self.emergency_mode else 0.0
+            )
+            records = [{
+                'measure_name': 'grid_state',
+                'measure_values': dict(zip(GRID_MEASURE_NAMES, values)),
+                'timestamp': time.time()  # Epoch seconds
+            }]
             
-            if records:
-                await self.store_timeseries_data('grid_metrics', records)
+            await self.store_timeseries_data('grid_metrics', records)
                 
         except Exception as e:
             self.logger.error("Error storing grid data", error=str(e))
 
     async def _process_message(self, message: AgentMessage):
         """Process incoming messages specific to grid optimization agent."""
-        if message.message_type == "energy_forecast":
-            await self._handle_energy_forecast(message)
-        elif message.message_type == "market_performance_report":
-            await self._handle_market_performance_report(message)
-        elif message.message_type == "grid_status_request":
-            await self._handle_grid_status_request(message)
+        handler = self._message_handlers.get(message.message_type)
+        if handler is not None:
+            await handler(message)
         else:
             await super()._process_message(message)
 
@@ -1049,34 +1330,33 @@ class GridOptimizationAgent(BaseAgent):
 
     async def get_status(self) -> Dict[str, Any]:
         """Get grid optimization agent status."""
+        grid_status = self._status_template['grid_status']
+        grid_status['frequency_hz'] = self.grid_frequency
+        grid_status['voltage_v'] = self.grid_voltage
+        grid_status['stability_score'] = self.grid_stability_score
+        grid_status['load_mw'] = self.grid_load
+        grid_status['supply_mw'] = self.grid_supply
+        grid_status['uptime_percentage'] = self.grid_uptime
+        
+        demand_response_status = self._status_template['demand_response_status']
+        demand_response_status['active'] = self.demand_response_active
+        demand_response_status['target_reduction_mw'] = self.demand_response_target
+        demand_response_status['duration_minutes'] = self._dr_remaining_s // 60
+        demand_response_status['participants_count'] = len(self.demand_response_participants)
+        demand_response_status['savings'] = self.demand_response_savings
+        
+        emergency_status = self._status_template['emergency_status']
+        emergency_status['active'] = self.emergency_mode
+        emergency_status['type'] = self.emergency_type
+        emergency_status['start_time'] = self._emergency_start_iso
+        emergency_status['response_count'] = self.emergency_response_count
+        
+        grid_health = self._status_template['grid_health']
+        grid_health['stability_threshold'] = self.grid_config.grid_stability_threshold
+        grid_health['demand_response_threshold'] = self.grid_config.demand_response_threshold
+        grid_health['monitoring_interval'] = self.grid_config.monitoring_interval_seconds
+        
+        # The template sections are refilled in place, so hand out copies
         status = await super().get_status()
-        status.update({
-            'grid_status': {
-                'frequency_hz': self.grid_frequency,
-                'voltage_v': self.grid_voltage,
-                'stability_score': self.grid_stability_score,
-                'load_mw': self.grid_load,
-                'supply_mw': self.grid_supply,
-                'uptime_percentage': self.grid_uptime
-            },
-            'demand_response_status': {
-                'active': self.demand_response_active,
-                'target_reduction_mw': self.demand_response_target,
-                'duration_minutes': int(self.demand_response_duration.total_seconds() / 60) if self.demand_response_duration else 0,
-                'participants_count': len(self.demand_response_participants),
-                'savings': self.demand_response_savings
-            },
-            'emergency_status': {
-                'active': self.emergency_mode,
-                'type': self.emergency_type,
-                'start_time': self.emergency_start_time.isoformat() if self.emergency_start_time else None,
-                'response_count': self.emergency_response_count
-            },
-            'optimization_status': self.optimization_status,
-            'grid_health': {
-                'stability_threshold': self.grid_config.grid_stability_threshold,
-                'demand_response_threshold': self.grid_config.demand_response_threshold,
-                'monitoring_interval': self.grid_config.monitoring_interval_seconds
-            }
-        })
+        status.update({name: section.copy() for name, section in self._status_template.items()})
         return status
@@ -121,7 +121,7 @@ class MarketSupervisorAgent(BaseAgent):
         self.market_efficiency: float = 0.0
         self.liquidity_score: float = 0.0
         
-        self.logger.info("Market Supervisor Agent initialized", config=config.dict())
+        self.logger.info("Market Supervisor Agent initialized")
 
     async def _start_agent_specific(self):
         """Start market supervisor-specific tasks."""
@@ -712,10 +712,14 @@ class MarketSupervisorAgent(BaseAgent):
             await self._handle_energy_offer(message)
         elif message.message_type == "energy_bid":
             await self._handle_energy_bid(message)
+        elif message.message_type == "energy_bid_batch":
+            await self._handle_energy_bid_batch(message)
         elif message.message_type == "offer_expired":
             await self._handle_offer_expired(message)
         elif message.message_type == "bid_expired":
             await self._handle_bid_expired(message)
+        elif message.message_type == "bid_expired_batch":
+            await self._handle_bid_expired_batch(message)
         elif message.message_type == "market_status_request":
             await self._handle_market_status_request(message)
         else:
@@ -756,35 +760,49 @@ class MarketSupervisorAgent(BaseAgent):
     async def _handle_energy_bid(self, message: AgentMessage):
         """Handle energy bids from consumers."""
         try:
-            bid_data = message.payload
-            
-            # Create market order
-            order = MarketOrder(
-                order_id=bid_data['bid_id'],
-                order_type='bid',
-                agent_id=bid_data['consumer_id'],
-                quantity_mw=bid_data['quantity_mw'],
-                price_per_mwh=bid_data['price_per_mwh'],
-                timestamp=datetime.fromisoformat(bid_data['timestamp']),
-                priority=bid_data.get('priority', 5),
-                valid_until=datetime.fromisoformat(bid_data['valid_until'])
-            )
-            
-            # Add to order book
-            self.order_book[order.order_id] = order
-            self.bids.append(order)
+            self._add_bid_order(message.payload)
             
             # Rebalance bid heap
             self.bids.sort(key=lambda x: (-x.priority, -x.price_per_mwh, x.timestamp))
             
-            self.logger.info("Energy bid received", 
-                           bid_id=order.order_id,
-                           quantity=order.quantity_mw,
-                           price=order.price_per_mwh)
-            
         except Exception as e:
             self.logger.error("Error handling energy bid", error=str(e))
 
+    async def _handle_energy_bid_batch(self, message: AgentMessage):
+        """Handle a batch of energy bids from a consumer."""
+        try:
+            for bid_data in message.payload['bids']:
+                self._add_bid_order(bid_data)
+            
+            # Rebalance bid heap once for the whole batch
+            self.bids.sort(key=lambda x: (-x.priority, -x.price_per_mwh, x.timestamp))
+            
+        except Exception as e:
+            self.logger.error("Error handling energy bid batch", error=str(e))
+
+    def _add_bid_order(self, bid_data: Dict[str, Any]):
+        """Create a bid order and add it to the order book."""
+        # Create market order
+        order = MarketOrder(
+            order_id=bid_data['bid_id'],
+            order_type='bid',
+            agent_id=bid_data['consumer_id'],
+            quantity_mw=bid_data['quantity_mw'],
+            price_per_mwh=bid_data['price_per_mwh'],
+            timestamp=datetime.fromisoformat(bid_data['timestamp']),
+            priority=bid_data.get('priority', 5),
+            valid_until=datetime.fromisoformat(bid_data['valid_until'])
+        )
+        
+        # Add to order book
+        self.order_book[order.order_id] = order
+        self.bids.append(order)
+        
+        self.logger.info("Energy bid received", 
+                       bid_id=order.order_id,
+                       quantity=order.quantity_mw,
+                       price=order.price_per_mwh)
+
     async def _handle_offer_expired(self, message: AgentMessage):
         """Handle expired offer notifications."""
         try:
@@ -805,20 +823,29 @@ class MarketSupervisorAgent(BaseAgent):
     async def _handle_bid_expired(self, message: AgentMessage):
         """Handle expired bid notifications."""
         try:
-            bid_data = message.payload
-            bid_id = bid_data['bid_id']
-            
-            # Remove from order book
-            if bid_id in self.order_book:
-                order = self.order_book.pop(bid_id)
-                if order in self.bids:
-                    self.bids.remove(order)
-                
-                self.logger.info("Bid expired and removed", bid_id=bid_id)
+            self._remove_bid_order(message.payload['bid_id'])
             
         except Exception as e:
             self.logger.error("Error handling expired bid", error=str(e))
 
+    async def _handle_bid_expired_batch(self, message: AgentMessage):
+        """Handle a batch of expired bid notifications."""
+        try:
+            for bid_id in message.payload['bid_ids']:
+                self._remove_bid_order(bid_id)
+            
+        except Exception as e:
+            self.logger.error("Error handling expired bid batch", error=str(e))
+
+    def _remove_bid_order(self, bid_id: str):
+        """Remove an expired bid from the order book."""
+        if bid_id in self.order_book:
+            order = self.order_book.pop(bid_id)
+            if order in self.bids:
+                self.bids.remove(order)
+            
+            self.logger.info("Bid expired and removed", bid_id=bid_id)
+
     async def _handle_market_status_request(self, message: AgentMessage):
         """Handle market status requests."""
         try:
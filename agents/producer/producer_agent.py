@@ -53,7 +53,7 @@ class ProducerAgent(BaseAgent):
         self.forecast_data: Optional[Dict[str, Any]] = None
         
         # Trading state
-        self.active_offers: List[Dict[str, Any]] = []
+        self.active_offers: Dict[str, Dict[str, Any]] = {}  # Keyed by offer_id
         self.completed_trades: List[Dict[str, Any]] = []
         self.total_revenue: float = 0.0
         self.total_energy_sold: float = 0.0
@@ -67,7 +67,7 @@ class ProducerAgent(BaseAgent):
         self.uptime_percentage: float = 0.95
         self.maintenance_schedule: List[Dict[str, Any]] = []
         
-        self.logger.info("Producer Agent initialized", config=config.dict())
+        self.logger.info("Producer Agent initialized")
 
     async def _start_agent_specific(self):
         """Start producer-specific tasks."""
@@ -465,7 +465,7 @@ class ProducerAgent(BaseAgent):
                     )
                     
                     # Add to active offers
-                    self.active_offers.append(offer)
+                    self.active_offers[offer['offer_id']] = offer
                     
                     self.logger.info("Market offer sent", offer=offer)
                 
@@ -492,14 +492,14 @@ class ProducerAgent(BaseAgent):
             current_time = datetime.now(timezone.utc)
             expired_offers = []
             
-            for offer in self.active_offers:
+            for offer in self.active_offers.values():
                 valid_until = datetime.fromisoformat(offer['valid_until'])
                 if current_time > valid_until:
                     expired_offers.append(offer)
             
             # Remove expired offers
             for expired_offer in expired_offers:
-                self.active_offers.remove(expired_offer)
+                del self.active_offers[expired_offer['offer_id']]
                 
                 # Notify market supervisor of expired offer
                 await self.send_message(
@@ -700,7 +700,7 @@ class ProducerAgent(BaseAgent):
             
             # Remove from active offers
             offer_id = trade.get('offer_id')
-            self.active_offers = [o for o in self.active_offers if o.get('offer_id') != offer_id]
+            self.active_offers.pop(offer_id, None)
             
             self.logger.info("Trade executed", 
                            trade_id=trade_id,
@@ -729,7 +729,7 @@ class ProducerAgent(BaseAgent):
             reason = offer.get('reason', 'unknown')
             
             # Remove from active offers
-            self.active_offers = [o for o in self.active_offers if o.get('offer_id') != offer_id]
+            self.active_offers.pop(offer_id, None)
             
             self.logger.info("Offer rejected", 
                            offer_id=offer_id,
@@ -14,6 +14,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from agents.base_agent import install_event_loop
 from agents.forecasting.forecasting_agent import ForecastingAgent, ForecastingAgentConfig
 from agents.producer.producer_agent import ProducerAgent, ProducerAgentConfig
 from agents.consumer.consumer_agent import ConsumerAgent, ConsumerAgentConfig
@@ -240,4 +241,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(main())
\ No newline at end of file
@@ -19,6 +19,7 @@ import argparse
 # Add project root to path
 sys.path.append('.')
 
+from agents.base_agent import install_event_loop
 from agents.forecasting.forecasting_agent import ForecastingAgent, ForecastingAgentConfig
 from agents.producer.producer_agent import ProducerAgent, ProducerAgentConfig
 from agents.consumer.consumer_agent import ConsumerAgent, ConsumerAgentConfig
@@ -446,6 +447,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_event_loop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
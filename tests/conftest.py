@@ -0,0 +1,11 @@
+"""Shared test setup for the energy trading agents."""
+
+import os
+import sys
+from pathlib import Path
+
+# The agents create boto3 clients at construction time, which needs a region
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+# Make the agents package importable from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
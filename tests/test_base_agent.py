@@ -0,0 +1,95 @@
+"""Tests for the shared agent message handling."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from agents.base_agent import AgentConfig, AgentMessage, BaseAgent
+
+
+class RecordingAgent(BaseAgent):
+    """Agent that records the custom messages it is given."""
+
+    def __init__(self):
+        super().__init__(AgentConfig(
+            agent_id='test-agent',
+            agent_type='test',
+            name='Test Agent',
+            description='Test agent',
+            capabilities=[]
+        ))
+        self.received = []
+
+    async def _start_agent_specific(self):
+        pass
+
+    async def _stop_agent_specific(self):
+        pass
+
+    async def _process_message(self, message: AgentMessage):
+        if message.message_type == 'demand_response_signal':
+            self.received.append((message.message_type, message.payload))
+        else:
+            await super()._process_message(message)
+
+
+def make_message(message_type: str, payload: dict) -> AgentMessage:
+    return AgentMessage(
+        message_id='msg-1',
+        sender_id='grid_optimization_agent',
+        recipient_id='test-agent',
+        message_type=message_type,
+        timestamp=datetime.now(timezone.utc),
+        payload=payload,
+        priority=9
+    )
+
+
+def test_emergency_batch_dispatches_each_signal():
+    agent = RecordingAgent()
+    batch = make_message('emergency_batch', {
+        'signals': [
+            {'message_type': 'demand_response_signal', 'payload': {'reduction_mw': 10.0}},
+            {'message_type': 'demand_response_signal', 'payload': {'reduction_mw': 5.0}}
+        ]
+    })
+
+    asyncio.run(agent._process_message(batch))
+
+    assert agent.received == [
+        ('demand_response_signal', {'reduction_mw': 10.0}),
+        ('demand_response_signal', {'reduction_mw': 5.0})
+    ]
+
+
+def test_send_message_many_records_one_message_per_recipient():
+    agent = RecordingAgent()
+    payload = {'signal': 'reduce'}
+
+    message_ids = asyncio.run(agent.send_message_many(['a', 'b'], 'grid_signal', payload, priority=5))
+
+    messages = list(agent.message_history)
+    assert [message.message_id for message in messages] == message_ids
+    assert [message.recipient_id for message in messages] == ['a', 'b']
+    assert messages[0].timestamp == messages[1].timestamp
+    # Recipients do not share the payload with each other or with the sender
+    assert messages[0].payload == messages[1].payload == payload
+    assert messages[0].payload is not messages[1].payload
+    assert messages[0].payload is not payload
+
+
+def test_failed_message_is_still_marked_done():
+    agent = RecordingAgent()
+
+    async def fail(message):
+        raise RuntimeError("handler failed")
+    agent._handle_custom_message = fail
+
+    async def run():
+        agent.is_running = True
+        processor = asyncio.create_task(agent._message_processor())
+        await agent.receive_message(make_message('unknown', {}))
+        await asyncio.wait_for(agent.message_queue.join(), timeout=1.0)
+        agent.is_running = False
+        await processor
+
+    asyncio.run(run())
@@ -0,0 +1,155 @@
+"""Tests for the consumer agent."""
+
+import asyncio
+
+from agents.consumer.consumer_agent import ConsumerAgent, ConsumerAgentConfig
+
+
+def make_agent(agent_id: str = 'test-consumer') -> ConsumerAgent:
+    return ConsumerAgent(ConsumerAgentConfig(
+        agent_id=agent_id,
+        agent_type='consumer',
+        name='Test Consumer Agent',
+        description='Test consumer agent',
+        capabilities=['energy_consumption']
+    ))
+
+
+def replace_tasks(agent: ConsumerAgent, runs: list, hold: asyncio.Event = None):
+    """Swap the agent's scheduled tasks for stubs that record (agent_id, task_name, events)."""
+    def stub(task_name):
+        async def run():
+            events = ['start']
+            runs.append((agent.agent_id, task_name, events))
+            now_ts = agent._now_ts
+            try:
+                if hold is not None:
+                    await hold.wait()
+                await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                events.append('cancelled')
+                raise
+            # The clock captured for this run must not be moved by another run
+            assert agent._now_ts == now_ts
+            events.append('done')
+        return run
+    for task_name in agent._scheduled_tasks:
+        agent._scheduled_tasks[task_name] = stub(task_name)
+
+
+def test_start_runs_periodic_tasks_and_stop_shuts_scheduler_down():
+    async def run():
+        agent = make_agent()
+        runs = []
+        replace_tasks(agent, runs)
+        await agent._start_agent_specific()
+        assert agent in ConsumerAgent._instances
+        await asyncio.sleep(0.2)
+        await agent._stop_agent_specific()
+        return agent, runs
+
+    agent, runs = asyncio.run(run())
+
+    # Everything but the regular flush is due immediately
+    expected = {name for name in agent._task_intervals if name != 'timestream_flush'}
+    assert {task_name for _, task_name, _ in runs} == expected
+    assert all(events == ['start', 'done'] for _, _, events in runs)
+    assert agent not in ConsumerAgent._instances
+    assert ConsumerAgent._shared_scheduler_task is None
+    assert not ConsumerAgent._shared_schedule
+
+
+def test_runs_of_one_agent_are_serialized():
+    async def run():
+        agent = make_agent()
+        active = []
+        peak = []
+        
+        async def tracked():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+        for task_name in agent._task_intervals:
+            agent._scheduled_tasks[task_name] = tracked
+        
+        await agent._start_agent_specific()
+        await asyncio.sleep(0.2)
+        await agent._stop_agent_specific()
+        return peak
+
+    peak = asyncio.run(run())
+
+    assert len(peak) == 4
+    assert max(peak) == 1
+
+
+def test_stop_cancels_in_flight_runs_before_final_flush():
+    async def run():
+        agent = make_agent()
+        runs = []
+        hold = asyncio.Event()
+        replace_tasks(agent, runs, hold)
+        flushed_with = []
+        
+        async def final_flush():
+            flushed_with.append(set(agent._running_ticks))
+        agent._flush_timeseries_buffer = final_flush
+        
+        await agent._start_agent_specific()
+        await asyncio.sleep(0.05)
+        assert runs  # A run is blocked on hold
+        await agent._stop_agent_specific()
+        return agent, runs, flushed_with
+
+    agent, runs, flushed_with = asyncio.run(run())
+
+    assert runs[0][2] == ['start', 'cancelled']
+    assert flushed_with == [set()]
+    assert not agent._running_ticks
+
+
+def test_agents_share_scheduler_and_stop_independently():
+    async def run():
+        first, second = make_agent('consumer-1'), make_agent('consumer-2')
+        runs = []
+        replace_tasks(first, runs)
+        replace_tasks(second, runs)
+        
+        await first._start_agent_specific()
+        scheduler = ConsumerAgent._shared_scheduler_task
+        await second._start_agent_specific()
+        assert ConsumerAgent._shared_scheduler_task is scheduler
+        await asyncio.sleep(0.2)
+        
+        # Stopping one agent leaves the other's tasks scheduled
+        await first._stop_agent_specific()
+        assert not scheduler.done()
+        assert {entry[2] for entry in ConsumerAgent._shared_schedule} == {second}
+        
+        await second._stop_agent_specific()
+        assert scheduler.done()
+        assert ConsumerAgent._shared_scheduler_task is None
+        return runs
+
+    runs = asyncio.run(run())
+
+    assert {agent_id for agent_id, _, _ in runs} == {'consumer-1', 'consumer-2'}
+
+
+def test_get_status_returns_independent_sections():
+    agent = make_agent()
+    first = asyncio.run(agent.get_status())
+    agent.current_market_price = 123.0
+    second = asyncio.run(agent.get_status())
+
+    assert first['trading_status'] is not second['trading_status']
+    assert second['trading_status']['current_market_price'] == 123.0
+    assert first['trading_status']['current_market_price'] != 123.0
+
+
+def test_update_config_changes_trading_interval():
+    agent = make_agent()
+    agent.update_config({'trading_interval_minutes': 2})
+
+    assert agent._task_intervals['trading'] == 120.0
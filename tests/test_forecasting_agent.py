@@ -0,0 +1,70 @@
+"""Tests for the forecasting agent."""
+
+import asyncio
+import threading
+import time
+
+import agents.forecasting.forecasting_agent as forecasting_agent
+from agents.forecasting.forecasting_agent import ForecastingAgent, ForecastingAgentConfig
+
+
+class StalledLambdaClient:
+    """Lambda client whose invoke blocks until released, like a hung model endpoint."""
+
+    def __init__(self, stall_seconds: float):
+        self.stall_seconds = stall_seconds
+        self.release = threading.Event()
+
+    def invoke(self, **kwargs):
+        self.release.wait(self.stall_seconds)
+        raise RuntimeError("released")
+
+
+def make_agent() -> ForecastingAgent:
+    return ForecastingAgent(ForecastingAgentConfig(
+        agent_id='test-forecasting',
+        agent_type='forecasting',
+        name='Test Forecasting Agent',
+        description='Test forecasting agent',
+        capabilities=['forecasting']
+    ))
+
+
+def test_stalled_model_call_times_out_to_fallback_forecast(monkeypatch):
+    monkeypatch.setattr(forecasting_agent, 'ML_CALL_TIMEOUT_SECONDS', 0.1)
+    agent = make_agent()
+    agent.model_loaded = True
+    agent._weather_fetched_at = float('inf')  # Weather is fresh; only the model is called
+    client = StalledLambdaClient(stall_seconds=2.0)
+    agent.lambda_client = client
+
+    async def run():
+        started = time.monotonic()
+        try:
+            return await agent._generate_forecast(), time.monotonic() - started
+        finally:
+            client.release.set()
+
+    forecast, elapsed = asyncio.run(run())
+
+    # A blocking invoke on the loop would hold it for the full stall
+    assert elapsed < 1.0
+
+    assert forecast['generation_method'] == 'statistical_fallback'
+    assert agent._ml_fail_count == 1
+
+
+def test_on_demand_forecast_is_not_published():
+    agent = make_agent()
+
+    async def run():
+        published = await agent._generate_forecast()
+        on_demand = await agent._coalesced_forecast(agent.forecast_config.forecast_horizon_hours + 6)
+        return published, on_demand
+
+    published, on_demand = asyncio.run(run())
+
+    assert on_demand is not None
+    assert on_demand['forecast_id'] != published['forecast_id']
+    assert agent.current_forecast is published
+    assert len(agent.forecast_history) == 1
@@ -0,0 +1,26 @@
+"""Tests for the grid optimization agent."""
+
+import asyncio
+
+from agents.grid_optimization.grid_optimization_agent import GridOptimizationAgent, GridOptimizationConfig
+
+
+def make_agent() -> GridOptimizationAgent:
+    return GridOptimizationAgent(GridOptimizationConfig(
+        agent_id='test-grid',
+        agent_type='grid_optimization',
+        name='Test Grid Optimization Agent',
+        description='Test grid optimization agent',
+        capabilities=['grid_optimization']
+    ))
+
+
+def test_get_status_returns_independent_sections():
+    agent = make_agent()
+    first = asyncio.run(agent.get_status())
+    agent.grid_frequency = 49.5
+    second = asyncio.run(agent.get_status())
+
+    assert first['grid_status'] is not second['grid_status']
+    assert second['grid_status']['frequency_hz'] == 49.5
+    assert first['grid_status']['frequency_hz'] != 49.5